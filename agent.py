@@ -13,14 +13,41 @@ from datetime import datetime
 from typing import Dict, Optional
 
 from core.parser import CodebaseParser
+from core.metadata_io import dump_metadata_document, load_metadata_document
+from core.columnar_store import write_columnar_metadata
+from core.symbol_index import SymbolIndex
+from core.parse_cache import ParseCache, DEFAULT_CACHE_DIR
+from core.repo_cache import RepositoryMirrorCache, DEFAULT_MIRROR_DIR
+from core.prefilter import FilePrefilter
 from core.graph_builder import DependencyGraphBuilder
 from core.llm_client import LLMClient
 from docs.generator import StructuredDocumentationGenerator
 
 class EnhancedDocumentationAgent:
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", jobs: int = 1,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, cache_size_mb: int = 512,
+                 fast_clone: bool = False, mirror_dir: Optional[str] = None,
+                 mirror_size_mb: int = 5120, prefilter: bool = True, max_file_size_mb: float = 10,
+                 columnar: bool = False, symbol_index_path: Optional[str] = None, slowest_files: int = 10,
+                 prefetch: int = 0, parser_backend: str = 'regex',
+                 sample_files: Optional[int] = None, sample_seconds: Optional[float] = None):
         self.output_dir = output_dir
-        self.parser = CodebaseParser()
+        self.sample_files = sample_files
+        self.sample_seconds = sample_seconds
+        self.slowest_files = slowest_files
+        self.columnar = columnar
+        self.symbol_index_path = symbol_index_path
+        self.fast_clone = fast_clone
+        self.mirror_cache = RepositoryMirrorCache(mirror_dir, mirror_size_mb * 1024 * 1024) if mirror_dir else None
+        cache = ParseCache(cache_dir, cache_size_mb * 1024 * 1024) if cache_dir else None
+        self.parser = CodebaseParser(jobs=jobs, cache=cache, compact=True, prefetch=prefetch,
+                                     backend=parser_backend)
+        if prefilter:
+            streaming_extensions = [ext for ext, lang in self.parser.supported_languages.items()
+                                    if lang in self.parser.streaming_parsers]
+            self.parser.prefilter = FilePrefilter(self.parser.supported_languages,
+                                                  max_file_size=int(max_file_size_mb * 1024 * 1024),
+                                                  size_exempt_extensions=streaming_extensions)
         self.graph_builder = DependencyGraphBuilder()
         self.llm_client = LLMClient()
         self.doc_generator = StructuredDocumentationGenerator(output_dir)
@@ -28,13 +55,18 @@ class EnhancedDocumentationAgent:
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
-    def run(self, github_url: str, max_file_summaries: int = 20) -> Dict[str, str]:
+    def run(self, github_url: str, max_file_summaries: int = 20,
+            previous_metadata_path: Optional[str] = None,
+            base_commit: Optional[str] = None) -> Dict[str, str]:
         """
         Run the enhanced documentation generation pipeline.
         
         Args:
             github_url: GitHub repository URL
             max_file_summaries: Maximum number of files to generate detailed summaries for
+            previous_metadata_path: metadata.json from an earlier run; enables incremental parsing
+            base_commit: Commit the previous metadata was generated from
+                (defaults to the commit recorded in previous_metadata_path)
             
         Returns:
             Dictionary with paths to generated files
@@ -44,19 +76,72 @@ class EnhancedDocumentationAgent:
         try:
             # Step 1: Clone and parse repository
             print("📥 Cloning repository...")
-            repo_path = self.parser.clone_repository(github_url)
+            if self.mirror_cache:
+                repo_path = self.mirror_cache.checkout(github_url)
+                clone_stats = self.mirror_cache.get_statistics()
+            else:
+                repo_path = self.parser.clone_repository(github_url, fast=self.fast_clone)
+                clone_stats = self.parser.clone_stats
+            print(f"   - {clone_stats['mode'].title()} clone: {clone_stats['seconds']}s, "
+                  f"{clone_stats['bytes'] / (1024 * 1024):.1f} MB transferred")
             
-            print("🔍 Parsing codebase (including JSP files)...")
-            metadata = self.parser.parse_codebase(repo_path)
+            head_commit = self.parser.get_head_commit(repo_path)
+            
+            if previous_metadata_path:
+                with open(previous_metadata_path, 'r', encoding='utf-8') as f:
+                    previous = load_metadata_document(f)
+                base_commit = base_commit or previous.get('commit')
+                if not base_commit:
+                    raise Exception("Incremental mode needs --base-commit (no commit recorded in previous metadata)")
+                print(f"🔍 Incrementally parsing changes since {base_commit[:12]}...")
+                if self.fast_clone and not self.mirror_cache:
+                    self.parser.fetch_commit(repo_path, base_commit)
+                metadata = self.parser.update_codebase(repo_path, previous['metadata'], base_commit)
+            else:
+                print("🔍 Parsing codebase (including JSP files)...")
+                metadata = self.parser.parse_codebase(repo_path, sample_files=self.sample_files,
+                                                      sample_seconds=self.sample_seconds)
             
             if metadata['total_files'] == 0:
                 raise Exception("No supported files found in repository")
             
             print(f"✅ Found {metadata['total_files']} files in {len(metadata['language_stats'])} languages")
             
+            sampling = metadata.get('sampling')
+            if sampling:
+                print(f"   - Estimated from a sample of {sampling['sampled_files']} of "
+                      f"{sampling['candidate_files']} files in {sampling['strata']} strata "
+                      f"(stopped on {sampling['stopped']}, {sampling['seconds']}s)")
+            
             # Display language breakdown
             for lang, stats in metadata['language_stats'].items():
-                print(f"   - {lang.title()}: {stats['files']} files")
+                estimate = f" (estimated, {stats['sampled_files']} parsed)" if stats.get('estimated') else ""
+                print(f"   - {lang.title()}: {stats['files']} files{estimate}")
+            
+            if self.parser.cache:
+                cache_stats = self.parser.cache.get_statistics()
+                print(f"   - Parse cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+            
+            if self.parser.prefilter:
+                rejections = self.parser.prefilter.get_statistics()
+                skipped = sum(r['files'] for r in rejections.values())
+                skipped_bytes = sum(r['bytes'] for r in rejections.values())
+                breakdown = ', '.join(f"{reason} {r['files']}" for reason, r in rejections.items() if r['files'])
+                print(f"   - Pre-filter skipped {skipped} files ({skipped_bytes / (1024 * 1024):.1f} MB unread)"
+                      + (f": {breakdown}" if breakdown else ""))
+            
+            if self.slowest_files:
+                print(f"⏱️  Parse profile (top {self.slowest_files} slowest files):")
+                for line in self.parser.profiler.format_report(self.slowest_files):
+                    print(f"   - {line}")
+            
+            if self.symbol_index_path:
+                with SymbolIndex(self.symbol_index_path) as symbol_index:
+                    # A sample covers only part of the tree; keep files it did not parse
+                    index_stats = symbol_index.index_metadata(metadata, commit=head_commit,
+                                                              prune=not sampling, repo_path=repo_path)
+                print(f"   - Symbol index: {index_stats['updated']} files updated, "
+                      f"{index_stats['unchanged']} unchanged, {index_stats['removed']} removed")
             
             # Step 2: Build enhanced dependency graph
             print("🕸️ Building enhanced dependency graph...")
@@ -94,20 +179,33 @@ class EnhancedDocumentationAgent:
             # Step 5: Save metadata
             metadata_path = os.path.join(self.output_dir, 'metadata.json')
             with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump({
+                dump_metadata_document({
                     'metadata': metadata,
                     'graph_stats': graph_stats,
                     'generation_time': datetime.now().isoformat(),
                     'repository_url': github_url,
+                    'commit': head_commit,
+                    'clone_stats': clone_stats,
                     'supported_languages': list(self.parser.supported_languages.values())
-                }, f, indent=2, default=str)
+                }, f)
+            profile_path = os.path.join(self.output_dir, 'profile.json')
+            with open(profile_path, 'w', encoding='utf-8') as f:
+                json.dump(self.parser.profiler.to_dict(), f, indent=2)
+            if self.columnar:
+                columnar_path = write_columnar_metadata(metadata, os.path.join(self.output_dir, 'metadata.cols'))
             
             # Cleanup temporary repository
-            shutil.rmtree(repo_path, ignore_errors=True)
+            if self.mirror_cache:
+                self.mirror_cache.release(repo_path)
+            else:
+                shutil.rmtree(repo_path, ignore_errors=True)
             
             # Prepare results
             results = generated_files.copy()
             results['metadata'] = metadata_path
+            results['profile'] = profile_path
+            if self.columnar:
+                results['metadata_columnar'] = columnar_path
             results['dependency_graph'] = dependency_graph_path
             
             print("\n✨ Enhanced documentation generation complete!")
@@ -134,6 +232,44 @@ def main():
     parser.add_argument('--output', '-o', default='output', help='Output directory (default: output)')
     parser.add_argument('--max-summaries', '-m', type=int, default=20, 
                        help='Maximum number of file summaries to generate (default: 20)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Parallel parser processes; 0 uses all CPUs (default: 1)')
+    parser.add_argument('--prefetch', type=int, default=0, metavar='THREADS',
+                       help='Read files ahead of the parser on this many threads, for slow/network storage '
+                            '(serial mode only; default: 0)')
+    parser.add_argument('--parser-backend', choices=['regex', 'tree-sitter'], default='regex',
+                       help='Java/JS/TS parser; tree-sitter needs the [tree-sitter] extra and falls back '
+                            'to regex when missing (default: regex)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'Parse cache directory, shared across clones (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-size-mb', type=int, default=512,
+                       help='Parse cache size cap in MB (default: 512)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the parse cache')
+    parser.add_argument('--max-file-size-mb', type=float, default=10,
+                       help='Skip files larger than this before reading them (default: 10)')
+    parser.add_argument('--no-prefilter', action='store_true',
+                       help='Disable the extension/size/binary/minified pre-filter')
+    parser.add_argument('--fast-clone', action='store_true',
+                       help='Depth-1, blob-filtered, sparse clone of supported files only')
+    parser.add_argument('--mirror-cache', nargs='?', const=DEFAULT_MIRROR_DIR, metavar='DIR',
+                       help=f'Reuse a local bare mirror per repository (default dir: {DEFAULT_MIRROR_DIR})')
+    parser.add_argument('--mirror-cache-size-mb', type=int, default=5120,
+                       help='Mirror cache size budget in MB; least recently used mirrors are evicted (default: 5120)')
+    parser.add_argument('--columnar', action='store_true',
+                       help='Also write output/metadata.cols, a memory-mappable columnar copy of the metadata')
+    parser.add_argument('--symbol-index', metavar='DB',
+                       help='SQLite symbol index to create or update incrementally with this run')
+    parser.add_argument('--slowest', type=int, default=10, metavar='N',
+                       help='Print the N slowest files to parse; 0 disables the report (default: 10)')
+    parser.add_argument('--incremental', metavar='METADATA_JSON',
+                       help='Previous metadata.json; only files changed since --base-commit are reparsed')
+    parser.add_argument('--base-commit',
+                       help='Commit the previous metadata was built from (default: the one recorded in it)')
+    parser.add_argument('--sample-files', type=int, metavar='N',
+                       help='Parse only a stratified sample of N files (per language and top-level directory) '
+                            'and estimate the totals, for very large repositories')
+    parser.add_argument('--sample-seconds', type=float, metavar='S',
+                       help='Stop parsing the stratified sample after S seconds; combines with --sample-files')
     
     args = parser.parse_args()
     
@@ -149,8 +285,27 @@ def main():
         print("   Or create a .env file with: GITHUB_TOKEN=your-key-here")
     
     try:
-        agent = EnhancedDocumentationAgent(args.output)
-        results = agent.run(args.github_url, args.max_summaries)
+        agent = EnhancedDocumentationAgent(
+            args.output,
+            jobs=args.jobs,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            cache_size_mb=args.cache_size_mb,
+            fast_clone=args.fast_clone,
+            mirror_dir=args.mirror_cache,
+            mirror_size_mb=args.mirror_cache_size_mb,
+            prefilter=not args.no_prefilter,
+            max_file_size_mb=args.max_file_size_mb,
+            columnar=args.columnar,
+            symbol_index_path=args.symbol_index,
+            slowest_files=args.slowest,
+            prefetch=args.prefetch,
+            parser_backend=args.parser_backend,
+            sample_files=args.sample_files,
+            sample_seconds=args.sample_seconds
+        )
+        results = agent.run(args.github_url, args.max_summaries,
+                            previous_metadata_path=args.incremental,
+                            base_commit=args.base_commit)
         
         print(f"\n🎉 Documentation generated successfully in '{args.output}' directory!")
         print("\n📖 To view the documentation:")
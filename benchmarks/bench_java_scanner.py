@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Java parser benchmark: legacy per-line regexes vs the token scanner.
+
+Checks the scanner against known declarations first (including Java 16
+records and 'record' used as an ordinary variable name), then generates a
+synthetic source file and reports throughput for both implementations.
+
+    python benchmarks/bench_java_scanner.py --size-mb 8
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scanners import scan_java
+
+CLASS_TEMPLATE = """package com.example.orders{n};
+
+import java.util.List;
+import static java.util.Objects.requireNonNull;
+
+@Service
+public class OrderService{n} extends BaseService implements Auditable {{
+    // public void commentedOut{n}() {{}}
+    private final Repository<Order> repository;
+
+    @Transactional(readOnly = true)
+    public List<Order> findOrders(String customer,
+                                  int limit) throws DataAccessException {{
+        String note = "class NotAClass {{ void nope() {{}} }}";
+        for (Record record : repository.records()) {{
+            audit(record.toString());
+        }}
+        return repository.find(requireNonNull(customer), limit);
+    }}
+
+    public record Summary{n}(int total, String currency) {{ }}
+}}
+"""
+
+# (source, expected classes, expected functions)
+CASES = [
+    ("class A { void f(List<Record> records) { for (Record record : records) { use(record); } "
+     "String s = record.toString(); } }",
+     ['A'], ['f']),
+    ("public record Point(int x, int y) { }\n@Deprecated record Pair<A, B>(A a, B b) {}\n"
+     "class C { record Inner(int v) {} void m() { record = null; record.x(); } }",
+     ['Point', 'Pair', 'C', 'Inner'], ['m']),
+    ("@interface Marker {}\nenum Color { RED; private Color() {} }\ninterface Shape { double area(); }",
+     ['Marker', 'Color', 'Shape'], ['Color']),
+]
+
+
+def legacy_parse_java(content: str) -> dict:
+    """The pre-scanner implementation of CodebaseParser._parse_java."""
+    functions = []
+    classes = []
+    imports = []
+    dependencies = []
+
+    for i, line in enumerate(content.split('\n')):
+        class_match = re.search(r'(?:public\s+)?(?:abstract\s+)?class\s+(\w+)', line)
+        if class_match:
+            classes.append({'name': class_match.group(1), 'line': i + 1})
+        method_match = re.search(r'(?:public|private|protected)?\s*(?:static\s+)?(?:\w+\s+)+(\w+)\s*\([^)]*\)\s*{', line)
+        if method_match:
+            functions.append({'name': method_match.group(1), 'line': i + 1})
+        import_match = re.search(r'import\s+([^;]+);', line)
+        if import_match:
+            imp_name = import_match.group(1).strip()
+            imports.append(imp_name)
+            dependencies.append({'type': 'import', 'name': imp_name, 'line': i + 1})
+
+    return {'functions': functions, 'classes': classes, 'imports': imports, 'dependencies': dependencies}
+
+
+def check_cases() -> int:
+    failures = 0
+    for source, classes, functions in CASES:
+        result = scan_java(source)
+        found = ([c['name'] for c in result['classes']], [f['name'] for f in result['functions']])
+        if found != (classes, functions):
+            failures += 1
+            print(f"  MISMATCH {source[:50]!r}...: got {found}, expected {(classes, functions)}")
+    return failures
+
+
+def build_source(size_mb: float) -> str:
+    chunks = []
+    size = 0
+    n = 0
+    while size < size_mb * 1024 * 1024:
+        chunk = CLASS_TEMPLATE.format(n=n)
+        chunks.append(chunk)
+        size += len(chunk)
+        n += 1
+    return ''.join(chunks)
+
+
+def best_time(func, content: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark Java parsing throughput')
+    arg_parser.add_argument('--size-mb', type=float, default=8, help='Synthetic source size in MB')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Timed runs per implementation (best is reported)')
+    args = arg_parser.parse_args()
+
+    failures = check_cases()
+    print(f"Known declarations: {len(CASES) - failures}/{len(CASES)} cases match")
+
+    content = build_source(args.size_mb)
+    mb = len(content) / (1024 * 1024)
+
+    legacy = best_time(legacy_parse_java, content, args.repeat)
+    scanner = best_time(scan_java, content, args.repeat)
+
+    print(f"Source: {mb:.1f} MB")
+    print(f"  legacy regexes: {legacy:6.2f}s  {mb / legacy:7.1f} MB/s")
+    print(f"  token scanner:  {scanner:6.2f}s  {mb / scanner:7.1f} MB/s")
+    print(f"  speedup:        {legacy / scanner:6.1f}x")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
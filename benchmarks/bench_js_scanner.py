@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+JavaScript parser benchmark: legacy per-line regexes vs the single-pass scanner.
+
+Generates a synthetic bundle and reports throughput for both implementations,
+then times the single-pass scanner on inputs that made earlier patterns
+backtrack; these should scale linearly with their size.
+
+    python benchmarks/bench_js_scanner.py --size-mb 8
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scanners import scan_javascript
+
+MODULE_TEMPLATE = """import React, {{ useState, useEffect }} from 'react';
+import {{
+  formatPrice,
+  parseDate as parse{n},
+}} from "./utils/format{n}";
+const lodash = require('lodash');
+// function commentedOut{n}() {{}}
+/* class Hidden{n} {{}} */
+export default class Widget{n} extends React.Component {{
+  render() {{
+    const total = this.props.items.reduce((acc, item) => acc + item.price * item.qty, 0);
+    if (total > LIMIT) {{ console.log('over limit: function x() {{}}', total); }}
+    return render(total, "class NotAClass");
+  }}
+}}
+export function helper{n}(value) {{ return formatPrice(value); }}
+export const compute{n} = async (a, b) => a + b;
+const handlers{n} = {{ onClick: function () {{ return 1; }}, onHover: async function () {{}} }};
+export {{ handlers{n} as defaultHandlers{n} }};
+"""
+
+
+def legacy_parse_javascript(content: str) -> dict:
+    """The pre-scanner implementation of CodebaseParser._parse_javascript."""
+    functions = []
+    classes = []
+    imports = []
+    exports = []
+    dependencies = []
+
+    func_pattern = r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)\s*=>|\([^)]*\)\s*{)|(\w+)\s*:\s*function)'
+    class_pattern = r'class\s+(\w+)'
+    import_pattern = r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]|require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
+    export_pattern = r'export\s+(?:default\s+)?(?:function\s+(\w+)|class\s+(\w+)|const\s+(\w+))'
+
+    for i, line in enumerate(content.split('\n')):
+        for match in re.finditer(func_pattern, line):
+            name = match.group(1) or match.group(2) or match.group(3)
+            if name:
+                functions.append({'name': name, 'line': i + 1})
+        for match in re.finditer(class_pattern, line):
+            classes.append({'name': match.group(1), 'line': i + 1})
+        for match in re.finditer(import_pattern, line):
+            imp_name = match.group(1) or match.group(2)
+            if imp_name:
+                imports.append(imp_name)
+                dependencies.append({'type': 'import', 'name': imp_name, 'line': i + 1})
+        for match in re.finditer(export_pattern, line):
+            name = match.group(1) or match.group(2) or match.group(3)
+            if name:
+                exports.append(name)
+
+    return {'functions': functions, 'classes': classes, 'imports': imports, 'exports': exports, 'dependencies': dependencies}
+
+
+# Unterminated constructs that must not be rescanned from every position
+PATHOLOGICAL = {
+    'bare import + spaces': lambda n: 'import' + ' ' * n,
+    'unterminated import list': lambda n: 'import {' + 'a, ' * (n // 3),
+    'repeated bare imports': lambda n: 'import a ' * (n // 9),
+}
+
+
+def build_bundle(size_mb: float) -> str:
+    chunks = []
+    size = 0
+    n = 0
+    while size < size_mb * 1024 * 1024:
+        chunk = MODULE_TEMPLATE.format(n=n)
+        chunks.append(chunk)
+        size += len(chunk)
+        n += 1
+    return ''.join(chunks)
+
+
+def best_time(func, content: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark JavaScript parsing throughput')
+    arg_parser.add_argument('--size-mb', type=float, default=8, help='Synthetic bundle size in MB')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Timed runs per implementation (best is reported)')
+    args = arg_parser.parse_args()
+
+    content = build_bundle(args.size_mb)
+    mb = len(content) / (1024 * 1024)
+
+    legacy = best_time(legacy_parse_javascript, content, args.repeat)
+    scanner = best_time(scan_javascript, content, args.repeat)
+
+    print(f"Bundle: {mb:.1f} MB")
+    print(f"  legacy regexes: {legacy:6.2f}s  {mb / legacy:7.1f} MB/s")
+    print(f"  single pass:    {scanner:6.2f}s  {mb / scanner:7.1f} MB/s")
+    print(f"  speedup:        {legacy / scanner:6.1f}x")
+
+    print("Pathological inputs (single pass, ms):")
+    for name, make in PATHOLOGICAL.items():
+        timings = [best_time(scan_javascript, make(n), args.repeat) * 1000 for n in (10000, 100000)]
+        print(f"  {name:<26} 10 KB {timings[0]:8.2f}   100 KB {timings[1]:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Parser throughput suite: files/s, MB/s and peak RSS for every _parse_*
+method and for parse_codebase end to end, on a deterministic synthetic
+corpus (see synthetic_corpus.py) or an existing tree.
+
+Each measurement runs in a fresh process so peak RSS is its own. Results
+are written as JSON; --compare prints the change against an earlier run.
+
+    python benchmarks/bench_parser.py --files 2000 --pathological minified,huge-sql,deep \
+        --jobs 1 4 --output bench-$(git rev-parse --short HEAD).json --compare bench-main.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import multiprocessing
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.parser import CodebaseParser
+from synthetic_corpus import add_corpus_arguments, corpus_kwargs, generate_corpus
+
+RESULTS_FORMAT_VERSION = 1
+
+
+def _peak_rss_mb(who: int) -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _child(sender, function, args) -> None:
+    baseline = _peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+    result = function(*args)
+    result['baseline_rss_mb'] = baseline
+    result['peak_rss_mb'] = _peak_rss_mb(resource.RUSAGE_SELF) if resource else None
+    if resource:
+        result['peak_rss_children_mb'] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+    sender.send(result)
+
+
+def run_isolated(function, *args) -> Dict:
+    """Run function(*args) in a fresh interpreter and add its peak RSS to the result dict."""
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(sender, function, args))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+def _rates(files: int, size: int, seconds: float) -> Dict:
+    return {
+        'files': files,
+        'bytes': size,
+        'seconds': round(seconds, 6),
+        'files_per_second': round(files / seconds, 1) if seconds else None,
+        'mb_per_second': round(size / (1024 * 1024) / seconds, 2) if seconds else None,
+    }
+
+
+def source_files(root: str) -> Dict[str, List[str]]:
+    """Candidate paths under root grouped by language, as parse_codebase would walk them."""
+    parser = CodebaseParser()
+    by_language = defaultdict(list)
+    for path in parser._iter_source_paths(root):
+        language = parser.classify_language(path)
+        if language != 'unknown':
+            by_language[language].append(path)
+    return by_language
+
+
+def measure_method(root: str, method: str, languages: List[str], repeat: int) -> Dict:
+    """Time one _parse_* method over the corpus files of its languages.
+
+    Reading and preparing content is excluded; each file is held only while
+    it is parsed. The best of ``repeat`` passes is reported.
+    """
+    parser = CodebaseParser()
+    files = source_files(root)
+    paths = [(language, path) for language in languages for path in files.get(language, [])]
+    parse = getattr(parser, method)
+    streaming = method in parser.streaming_parsers.values()
+
+    best = None
+    size = 0
+    for _ in range(repeat):
+        elapsed = 0.0
+        size = 0
+        for language, path in paths:
+            if streaming:
+                size += os.path.getsize(path)
+                start = time.perf_counter()
+                parse(path)
+            else:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                size += len(data)
+                content = parser._content(language, data)
+                start = time.perf_counter()
+                parse(content, path)
+            elapsed += time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return _rates(len(paths), size, best or 0.0)
+
+
+def measure_parse_codebase(root: str, jobs: int, repeat: int) -> Dict:
+    """Time parse_codebase (walk, read, parse, aggregate) with jobs workers."""
+    best = None
+    metadata = None
+    for _ in range(repeat):
+        parser = CodebaseParser(jobs=jobs)
+        start = time.perf_counter()
+        metadata = parser.parse_codebase(root)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    size = sum(os.path.getsize(os.path.join(root, file_data['path'])) for file_data in metadata['files'])
+    return dict(_rates(metadata['total_files'], size, best), jobs=jobs)
+
+
+def methods_by_name() -> Dict[str, List[str]]:
+    """Every parser method with the languages it handles."""
+    parser = CodebaseParser()
+    methods = defaultdict(list)
+    for language, method in parser.parsers.items():
+        methods[method].append(language)
+    for language, method in parser.streaming_parsers.items():
+        methods[method].append(language)
+    return dict(methods)
+
+
+def compare(results: Dict, base: Dict) -> List[str]:
+    """Lines comparing MB/s and peak RSS with a previous results file."""
+    def row(name: str, new: Dict, old: Optional[Dict]) -> str:
+        if not old or not old.get('mb_per_second') or not new.get('mb_per_second'):
+            return f"  {name:<28} {new.get('mb_per_second') or 0:9.2f} MB/s  (no baseline)"
+        speed = new['mb_per_second'] / old['mb_per_second']
+        rss = ''
+        if new.get('peak_rss_mb') and old.get('peak_rss_mb'):
+            rss = f"  RSS {old['peak_rss_mb']:.0f} -> {new['peak_rss_mb']:.0f} MB"
+        return (f"  {name:<28} {old['mb_per_second']:9.2f} -> {new['mb_per_second']:9.2f} MB/s "
+                f"({speed:5.2f}x){rss}")
+
+    lines = [f"Compared with {base['meta'].get('commit') or 'baseline'}:"]
+    for method, stats in results['methods'].items():
+        lines.append(row(method, stats, base['methods'].get(method)))
+    old_runs = {run['jobs']: run for run in base['parse_codebase']}
+    for run in results['parse_codebase']:
+        lines.append(row(f"parse_codebase jobs={run['jobs']}", run, old_runs.get(run['jobs'])))
+    return lines
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark CodebaseParser throughput and memory')
+    add_corpus_arguments(arg_parser)
+    arg_parser.add_argument('--corpus', help='Benchmark an existing tree instead of generating one')
+    arg_parser.add_argument('--keep', action='store_true', help='Keep the generated corpus')
+    arg_parser.add_argument('--jobs', type=int, nargs='+', default=[1], help='parse_codebase job counts (default: 1)')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Passes per measurement; the best is kept')
+    arg_parser.add_argument('--output', '-o', help='Write results JSON here')
+    arg_parser.add_argument('--compare', help='Previous results JSON to compare against')
+    args = arg_parser.parse_args()
+
+    root = args.corpus or tempfile.mkdtemp(prefix='bench-parser-')
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'meta': {
+            'commit': CodebaseParser().get_head_commit(REPO_ROOT),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'repeat': args.repeat,
+        },
+        'methods': {},
+        'parse_codebase': [],
+    }
+    try:
+        if args.corpus:
+            results['corpus'] = {'path': os.path.abspath(args.corpus)}
+        else:
+            settings = corpus_kwargs(args)
+            results['corpus'] = dict(generate_corpus(root, **settings), settings=settings)
+            print(f"Corpus: {results['corpus']['files']} files, "
+                  f"{results['corpus']['bytes'] / (1024 * 1024):.1f} MB in {root}")
+
+        for method, languages in methods_by_name().items():
+            stats = run_isolated(measure_method, root, method, languages, args.repeat)
+            if not stats['files']:
+                continue
+            results['methods'][method] = dict(stats, languages=languages)
+            print(f"  {method:<20} {stats['files']:6} files {stats['files_per_second'] or 0:10.1f} files/s "
+                  f"{stats['mb_per_second'] or 0:8.2f} MB/s  peak RSS {stats['peak_rss_mb']} MB")
+
+        for jobs in args.jobs:
+            stats = run_isolated(measure_parse_codebase, root, jobs, args.repeat)
+            results['parse_codebase'].append(stats)
+            print(f"  parse_codebase jobs={jobs:<3} {stats['files']:6} files {stats['files_per_second'] or 0:10.1f} files/s "
+                  f"{stats['mb_per_second'] or 0:8.2f} MB/s  peak RSS {stats['peak_rss_mb']} MB "
+                  f"(workers {stats.get('peak_rss_children_mb')} MB)")
+    finally:
+        if not args.corpus and not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        print('\n'.join(compare(results, base)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+PatternScanner benchmark: scan time per MB as rules are added.
+
+Compares the legacy approach (every pattern searched on every line) with one
+combined alternation scanned once, for the JSP rules plus a growing number
+of extra synthetic rules, and checks that the JSP results are unchanged.
+
+    python benchmarks/bench_pattern_scanner.py --size-mb 4 --rules 4 8 16 32
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scanners import JSP_RULES, PatternScanner, scan_jsp
+
+PAGE_TEMPLATE = """<%@ page contentType="text/html;charset=UTF-8" import="com.example.model.Order{n}" %>
+<%@ taglib prefix="c" uri="http://java.sun.com/jsp/jstl/core" %>
+<%@ include file="/WEB-INF/header{n}.jsp" %>
+<html><body>
+<c:forEach items="${{orders}}" var="order">
+  <tr><td>${{order.id}}</td><td><fmt:formatNumber value="${{order.total}}" type="currency"/></td></tr>
+</c:forEach>
+<c:if test="${{empty orders}}"><jsp:forward page="/empty{n}.jsp"/></c:if>
+<p>Plain markup line {n} with <b>bold</b> text and <a href="page{n}.jsp">a link</a>.</p>
+</body></html>
+"""
+
+LEGACY_PATTERNS = [
+    r'<%@\s*page\s+.*?import\s*=\s*["\']([^"\']+)["\']',
+    r'<%@\s*include\s+file\s*=\s*["\']([^"\']+)["\']',
+    r'<jsp:forward\s+page\s*=\s*["\']([^"\']+)["\']',
+    r'<(\w+):(\w+)',
+]
+
+
+def extra_rules(count: int):
+    """Synthetic rules with distinct prefixes, like further directives or EL lookups."""
+    patterns = [r'@Extra{i}\(\s*"([^"]*)"\s*\)', r'\$\{{bean{i}\.(\w+)\}}', r'<%--\s*TODO{i}:\s*([^\n]*)']
+    return [(f'extra{i}', patterns[i % len(patterns)].format(i=i), lambda result, line, *groups: None)
+            for i in range(count)]
+
+
+def legacy_scan(content: str, patterns) -> int:
+    hits = 0
+    for line in content.split('\n'):
+        for pattern in patterns:
+            hits += len(re.findall(pattern, line))
+    return hits
+
+
+def timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark combined-alternation scanning')
+    arg_parser.add_argument('--size-mb', type=float, default=4, help='Size of the synthetic JSP text')
+    arg_parser.add_argument('--rules', type=int, nargs='+', default=[4, 8, 16, 32],
+                            help='Total rule counts to measure (at least the 4 JSP rules)')
+    args = arg_parser.parse_args()
+
+    pages = []
+    size = 0
+    while size < args.size_mb * 1024 * 1024:
+        pages.append(PAGE_TEMPLATE.format(n=len(pages)))
+        size += len(pages[-1])
+    content = ''.join(pages)
+    mb = len(content) / (1024 * 1024)
+
+    print(f"Corpus: {mb:.1f} MB of JSP")
+    print(f"  {'rules':>5}  {'legacy ms/MB':>12}  {'combined ms/MB':>14}")
+    for count in args.rules:
+        extras = extra_rules(max(count - len(JSP_RULES), 0))
+        scanner = PatternScanner(JSP_RULES + extras)
+        legacy_patterns = LEGACY_PATTERNS + [pattern for _, pattern, _ in extras]
+        legacy = timed(legacy_scan, content, legacy_patterns)
+        combined = timed(scanner.scan, content, {'jsp_tags': [], 'java_imports': [], 'jsp_includes': [],
+                                                   'dependencies': []})
+        print(f"  {count:>5}  {legacy * 1000 / mb:12.1f}  {combined * 1000 / mb:14.1f}")
+
+    result = scan_jsp(content)
+    print(f"  scan_jsp: {len(result['dependencies'])} dependencies, {len(result['jsp_tags'])} custom tags")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tree-sitter benchmark: full parse vs incremental reparse after a small edit,
+and extraction time compared with the regex scanner.
+
+Needs the optional grammars: pip install -e .[tree-sitter]
+
+    python benchmarks/bench_treesitter_incremental.py --modules 2000 --edits 20
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.scanners import scan_javascript
+from core.treesitter_backend import TreeSitterBackend
+
+
+def javascript_source(modules: int) -> str:
+    return ''.join(
+        f"import {{ helper{n} }} from './lib/helper{n}';\n"
+        f"export class Widget{n} {{\n"
+        f"  render(props) {{ return helper{n}(props.value * {n}); }}\n"
+        f"}}\n"
+        f"export const build{n} = (value) => new Widget{n}().render({{ value }});\n\n"
+        for n in range(modules))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark incremental tree-sitter reparsing')
+    arg_parser.add_argument('--modules', type=int, default=2000, help='Synthetic modules in the file')
+    arg_parser.add_argument('--edits', type=int, default=20, help='Single-line edits to apply')
+    args = arg_parser.parse_args()
+
+    backend = TreeSitterBackend()
+    if not backend.supports('javascript'):
+        sys.exit('tree-sitter or tree-sitter-javascript is not installed')
+    parser = backend._parser('javascript')
+
+    content = javascript_source(args.modules)
+    source = content.encode('utf-8')
+    start = time.perf_counter()
+    parser.parse(source)
+    full = time.perf_counter() - start
+
+    path = 'bench.js'
+    backend.parse('javascript', content, path)
+    incremental = 0.0
+    for i in range(args.edits):
+        # Change one statement in the middle of the file
+        content = content.replace(f'helper{args.modules // 2}(props.value * ',
+                                  f'helper{args.modules // 2}(props.value + {i} * ', 1)
+        source = content.encode('utf-8')
+        start = time.perf_counter()
+        backend._parse_tree(parser, 'javascript', path, source)
+        incremental += time.perf_counter() - start
+
+    start = time.perf_counter()
+    extracted = backend.parse('javascript', content, path)
+    extract = time.perf_counter() - start
+    start = time.perf_counter()
+    scanned = scan_javascript(content)
+    regex = time.perf_counter() - start
+
+    print(f"File: {len(source) / (1024 * 1024):.1f} MB, {args.modules} modules")
+    print(f"  full parse:           {full * 1000:8.1f} ms")
+    print(f"  incremental reparse:  {incremental / args.edits * 1000:8.1f} ms (mean of {args.edits})")
+    print(f"  tree-sitter extract:  {extract * 1000:8.1f} ms")
+    print(f"  regex scanner:        {regex * 1000:8.1f} ms")
+    print(f"  same imports:         {extracted['imports'] == scanned['imports']}")
+
+
+if __name__ == '__main__':
+    main()
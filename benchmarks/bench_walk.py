@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Walk benchmark: legacy substring should_ignore_path vs the compiled PathMatcher.
+
+Builds a synthetic tree with the requested number of entries (files plus
+directories, including node_modules/build/.git noise and a .gitignore) and
+times a full source-path walk with each strategy.
+
+    python benchmarks/bench_walk.py --entries 500000
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parser import CodebaseParser
+
+EXTENSIONS = ['.py', '.js', '.java', '.html', '.css', '.sql', '.md', '.pyc', '.class', '.log']
+NOISE_DIRS = ['node_modules', 'build', '.git', 'target', 'logs']
+
+
+def build_tree(root: str, entries: int, files_per_dir: int = 20, fanout: int = 8) -> int:
+    """Create a synthetic repository with roughly ``entries`` files and directories."""
+    with open(os.path.join(root, '.gitignore'), 'w') as f:
+        f.write('*.log\nlogs/\n')
+
+    created = 0
+    queue = ['']
+    dir_index = 0
+    while queue and created < entries:
+        rel_dir = queue.pop(0)
+        abs_dir = os.path.join(root, rel_dir)
+        for i in range(files_per_dir):
+            if created >= entries:
+                break
+            ext = EXTENSIONS[(dir_index + i) % len(EXTENSIONS)]
+            open(os.path.join(abs_dir, f'file_{i}{ext}'), 'w').close()
+            created += 1
+        for i in range(fanout):
+            if created >= entries:
+                break
+            name = NOISE_DIRS[dir_index % len(NOISE_DIRS)] if i == 0 else f'pkg_{dir_index}_{i}'
+            os.makedirs(os.path.join(abs_dir, name), exist_ok=True)
+            queue.append(os.path.join(rel_dir, name))
+            created += 1
+        dir_index += 1
+    return created
+
+
+def legacy_should_ignore(ignore_patterns, path: str) -> bool:
+    """The pre-PathMatcher substring check, kept here for comparison."""
+    for part in Path(path).parts:
+        if any(pattern in part or part.startswith('.') and pattern.startswith('.')
+               for pattern in ignore_patterns):
+            return True
+    return False
+
+
+def legacy_walk(parser: CodebaseParser, repo_path: str) -> int:
+    count = 0
+    for root, dirs, files in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if not legacy_should_ignore(parser.ignore_patterns, os.path.join(root, d))]
+        for file in files:
+            if not legacy_should_ignore(parser.ignore_patterns, os.path.join(root, file)):
+                count += 1
+    return count
+
+
+def compiled_walk(parser: CodebaseParser, repo_path: str) -> int:
+    return sum(1 for _ in parser._iter_source_paths(repo_path))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark ignore-aware repository walks')
+    arg_parser.add_argument('--entries', type=int, default=500000, help='Files plus directories to create')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Timed runs per strategy (best is reported)')
+    args = arg_parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_walk_')
+    try:
+        start = time.perf_counter()
+        created = build_tree(root, args.entries)
+        print(f"Built {created:,} entries in {time.perf_counter() - start:.1f}s at {root}")
+
+        parser = CodebaseParser()
+        for name, walk in (('legacy substring', legacy_walk), ('compiled matcher', compiled_walk)):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                kept = walk(parser, root)
+                timings.append(time.perf_counter() - start)
+            print(f"{name:>18}: {min(timings):7.2f}s  ({kept:,} files kept)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
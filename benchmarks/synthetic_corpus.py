@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic repository generator for parser benchmarks.
+
+The same arguments and seed always produce byte-identical trees, so
+results from different commits are comparable. Files follow a language mix
+and a size distribution; optional pathological cases add a minified JS
+bundle, a huge SQL dump and deeply nested directories and code.
+
+    python benchmarks/synthetic_corpus.py /tmp/corpus --files 2000 \
+        --mix python=40,javascript=25,java=20,jsp=5,html=4,css=3,sql=3 \
+        --sizes lognormal --mean-kb 8 --pathological minified,huge-sql,deep
+"""
+
+import os
+import random
+import argparse
+from typing import Dict, List
+
+EXTENSIONS = {
+    'python': '.py', 'javascript': '.js', 'typescript': '.ts', 'java': '.java',
+    'jsp': '.jsp', 'html': '.html', 'css': '.css', 'sql': '.sql',
+}
+
+DEFAULT_MIX = 'python=35,javascript=20,typescript=5,java=20,jsp=5,html=5,css=5,sql=5'
+SIZE_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal')
+PATHOLOGICAL_CASES = ('minified', 'huge-sql', 'deep')
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse 'python=40,java=20' into normalised weights."""
+    weights = {}
+    for item in mix.split(','):
+        language, _, weight = item.partition('=')
+        language = language.strip()
+        if language not in EXTENSIONS:
+            raise ValueError(f"Unknown language {language!r}; choose from {', '.join(EXTENSIONS)}")
+        weights[language] = float(weight or 1)
+    total = sum(weights.values())
+    return {language: weight / total for language, weight in weights.items()}
+
+
+def python_unit(n: int) -> str:
+    return (f'\n\nclass Service{n}(BaseService):\n    """Handles requests for resource {n}."""\n\n'
+            f'    def handle(self, request: Dict) -> Dict:\n        """Return the payload for {n}."""\n'
+            f'        return {{"id": {n}, "path": os.path.join("data", str(request))}}\n\n'
+            f'    async def refresh(self):\n        await self.cache.invalidate({n})\n\n\n'
+            f'def helper_{n}(values: List[int]) -> int:\n    return sum(v * {n} for v in values)\n')
+
+
+def javascript_unit(n: int) -> str:
+    return (f"import {{ format{n} }} from './utils/format{n % 50}';\n"
+            f"const lib{n} = require('lib-{n % 20}');\n"
+            f"/* class Hidden{n} {{}} */\n"
+            f"export class Widget{n} extends Base {{\n"
+            f"  render(props) {{ return format{n}(props.value, 'function x() {{}}'); }}\n}}\n"
+            f"export function helper{n}(value) {{ return value * {n}; }}\n"
+            f"export const compute{n} = async (a, b) => a + b;\n"
+            f"const handlers{n} = {{ onClick: function () {{ return {n}; }} }};\n\n")
+
+
+def typescript_unit(n: int) -> str:
+    return (f"import type {{ Model{n} }} from './models/model{n % 30}';\n"
+            f"export interface Props{n} {{ id: number; label: string }}\n"
+            f"export class Store{n}<T extends Model{n}> {{\n"
+            f"  private items: T[] = [];\n"
+            f"  add(item: T): void {{ this.items.push(item); }}\n}}\n"
+            f"export const select{n} = (state: Props{n}): number => state.id;\n\n")
+
+
+def java_header(n: int) -> str:
+    return (f'package com.example.svc{n % 40};\n\nimport java.util.List;\nimport java.util.Map;\n'
+            f'import com.example.common.Util{n % 25};\n\n@Service\npublic class Handler{n} {{\n')
+
+
+def java_unit(n: int) -> str:
+    return (f'    /** Computes value {n}. */\n    @Override\n'
+            f'    public Map<String, List<Integer>> compute{n}(final List<Integer> values,\n'
+            f'            Map<String, Object> options) throws java.io.IOException {{\n'
+            f'        return Util{n % 25}.group(values, "{n}");\n    }}\n\n')
+
+
+def jsp_unit(n: int) -> str:
+    return (f'<%@ page import="com.example.model.Order{n}" %>\n<%@ include file="/WEB-INF/part{n % 10}.jsp" %>\n'
+            f'<c:forEach items="${{orders}}" var="o"><fmt:formatNumber value="${{o.total}}"/></c:forEach>\n'
+            f'<c:if test="${{empty orders}}"><jsp:forward page="/empty{n}.jsp"/></c:if>\n')
+
+
+def html_unit(n: int) -> str:
+    return (f'<div class="row" id="r{n}"><a href="detail/{n}.html">Item {n}</a>'
+            f'<img src="img/{n}.png" alt="item {n}"/></div>\n'
+            f'<script src="js/widget{n % 15}.js"></script><!-- <img src="old{n}.png"> -->\n')
+
+
+def css_unit(n: int) -> str:
+    return (f'@import "theme{n % 5}.css";\n.widget-{n}, .widget-{n} > .title {{ color: #{n % 4096:03x}; }}\n'
+            f'#panel{n} .item:hover {{ margin: {n % 16}px; }}\n')
+
+
+def sql_unit(n: int) -> str:
+    return (f'CREATE TABLE IF NOT EXISTS orders_{n} (\n    id INT PRIMARY KEY,\n'
+            f'    customer_id INT REFERENCES customers_{n % 100}(id)\n);\n'
+            f'CREATE OR REPLACE FUNCTION total_{n}() RETURNS INT AS $$ SELECT {n} $$;\n'
+            f'INSERT INTO orders_{n} VALUES ({n}, {n % 100});\n')
+
+
+UNITS = {
+    'python': python_unit, 'javascript': javascript_unit, 'typescript': typescript_unit,
+    'java': java_unit, 'jsp': jsp_unit, 'html': html_unit, 'css': css_unit, 'sql': sql_unit,
+}
+
+HEADERS = {
+    'python': lambda n: 'import os\nfrom typing import Dict, List\n\nfrom app.base import BaseService\n',
+    'java': java_header,
+    'html': lambda n: f'<!DOCTYPE html>\n<html><head><link rel="stylesheet" href="css/site{n % 5}.css"></head><body>\n',
+}
+
+FOOTERS = {
+    'java': lambda n: '}\n',
+    'html': lambda n: '</body></html>\n',
+}
+
+
+def render(language: str, n: int, target_bytes: int) -> str:
+    """Source for one file of roughly target_bytes, built from repeated units."""
+    parts = [HEADERS[language](n)] if language in HEADERS else []
+    size = sum(len(part) for part in parts)
+    unit = UNITS[language]
+    i = 0
+    while size < target_bytes or i == 0:
+        parts.append(unit(n * 1000 + i))
+        size += len(parts[-1])
+        i += 1
+    if language in FOOTERS:
+        parts.append(FOOTERS[language](n))
+    return ''.join(parts)
+
+
+def sample_size(rng: random.Random, distribution: str, mean: int) -> int:
+    if distribution == 'fixed':
+        return mean
+    if distribution == 'uniform':
+        return rng.randint(mean // 4, mean * 7 // 4)
+    # Lognormal with the requested mean: many small files and a long tail
+    sigma = 1.0
+    return max(256, int(rng.lognormvariate(0, sigma) * mean / 1.6487))
+
+
+def minified_javascript(target_bytes: int) -> str:
+    units = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        units.append(f'var a{i}=function(b){{return b*{i}}};function f{i}(c,d){{return a{i}(c)+d}}'
+                     f'export const g{i}=(x)=>f{i}(x,{i});')
+        size += len(units[-1])
+        i += 1
+    return ''.join(units) + '\n'
+
+
+def deeply_nested_python(depth: int) -> str:
+    lines = []
+    for level in range(depth):
+        indent = '    ' * level
+        keyword = 'class' if level % 2 == 0 else 'def'
+        signature = f'Level{level}:' if keyword == 'class' else f'level_{level}(self):'
+        lines.append(f'{indent}{keyword} {signature}')
+    lines.append('    ' * depth + 'pass')
+    return '\n'.join(lines) + '\n'
+
+
+def deeply_nested_javascript(depth: int) -> str:
+    opening = ''.join(f'{"  " * level}function nest{level}() {{\n' for level in range(depth))
+    closing = ''.join(f'{"  " * level}}}\n' for level in reversed(range(depth)))
+    return opening + '  ' * depth + 'return 0;\n' + closing
+
+
+def generate_corpus(root: str, files: int = 1000, mix: str = DEFAULT_MIX, sizes: str = 'lognormal',
+                    mean_kb: float = 8, pathological: List[str] = (), huge_sql_mb: float = 16,
+                    minified_mb: float = 2, depth: int = 40, seed: int = 0) -> Dict:
+    """Write the corpus under root and return a summary of what was written."""
+    rng = random.Random(seed)
+    weights = parse_mix(mix)
+    languages = list(weights)
+    mean = int(mean_kb * 1024)
+    summary = {'files': 0, 'bytes': 0, 'languages': {}}
+
+    def write(rel_path: str, language: str, text: str) -> None:
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = text.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        stats = summary['languages'].setdefault(language, {'files': 0, 'bytes': 0})
+        stats['files'] += 1
+        stats['bytes'] += len(data)
+        summary['files'] += 1
+        summary['bytes'] += len(data)
+
+    for n in range(files):
+        language = rng.choices(languages, weights=[weights[language] for language in languages])[0]
+        directory = f'src/module{n % 25}/pkg{n % 7}'
+        write(f'{directory}/{language}_{n}{EXTENSIONS[language]}', language,
+              render(language, n, sample_size(rng, sizes, mean)))
+
+    if 'minified' in pathological:
+        write('static/vendor/bundle.min.js', 'javascript', minified_javascript(int(minified_mb * 1024 * 1024)))
+    if 'huge-sql' in pathological:
+        target = int(huge_sql_mb * 1024 * 1024)
+        units = []
+        size = 0
+        i = 0
+        while size < target:
+            units.append(sql_unit(i))
+            size += len(units[-1])
+            i += 1
+        write('db/dump.sql', 'sql', ''.join(units))
+    if 'deep' in pathological:
+        nested = '/'.join(f'level{level}' for level in range(depth))
+        write(f'deep/{nested}/nested.py', 'python', deeply_nested_python(min(depth, 90)))
+        write(f'deep/{nested}/nested.js', 'javascript', deeply_nested_javascript(depth * 5))
+
+    return summary
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Corpus options shared with the benchmark scripts."""
+    parser.add_argument('--files', type=int, default=1000, help='Regular files to generate (default: 1000)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Language weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--sizes', choices=SIZE_DISTRIBUTIONS, default='lognormal',
+                        help='File-size distribution (default: lognormal)')
+    parser.add_argument('--mean-kb', type=float, default=8, help='Mean file size in KB (default: 8)')
+    parser.add_argument('--pathological', default='',
+                        help=f"Comma-separated extra cases: {', '.join(PATHOLOGICAL_CASES)}")
+    parser.add_argument('--huge-sql-mb', type=float, default=16, help='Size of the huge-sql dump (default: 16)')
+    parser.add_argument('--minified-mb', type=float, default=2, help='Size of the minified bundle (default: 2)')
+    parser.add_argument('--depth', type=int, default=40, help='Directory and nesting depth for deep (default: 40)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+
+
+def corpus_kwargs(args: argparse.Namespace) -> Dict:
+    pathological = [case.strip() for case in args.pathological.split(',') if case.strip()]
+    for case in pathological:
+        if case not in PATHOLOGICAL_CASES:
+            raise ValueError(f"Unknown pathological case {case!r}")
+    return {'files': args.files, 'mix': args.mix, 'sizes': args.sizes, 'mean_kb': args.mean_kb,
+            'pathological': pathological, 'huge_sql_mb': args.huge_sql_mb,
+            'minified_mb': args.minified_mb, 'depth': args.depth, 'seed': args.seed}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Generate a deterministic synthetic repository')
+    arg_parser.add_argument('root', help='Directory to write the corpus into')
+    add_corpus_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    summary = generate_corpus(args.root, **corpus_kwargs(args))
+    print(f"Wrote {summary['files']} files, {summary['bytes'] / (1024 * 1024):.1f} MB to {args.root}")
+    for language, stats in sorted(summary['languages'].items()):
+        print(f"  {language:<11} {stats['files']:6} files  {stats['bytes'] / (1024 * 1024):8.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+# core/columnar_store.py
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Union
+
+MAGIC = b'CDGCOLS1'
+_HEADER = struct.Struct('<8sQ')
+_ALIGN = 8
+
+# table -> [(column, kind)] where kind is 'int' (int64), 'str' (utf-8 with an
+# int64 offset array) or 'category' (int32 codes into a value list kept in the
+# header). Symbol tables are written in file order and point back to their
+# file through the 'file' row index.
+SCHEMA = {
+    'files': [('path', 'str'), ('language', 'category'), ('size', 'int'), ('lines', 'int'),
+              ('functions', 'int'), ('classes', 'int'), ('imports', 'int'), ('dependencies', 'int')],
+    'functions': [('file', 'int'), ('name', 'str'), ('qualname', 'str'), ('line', 'int'),
+                  ('end_line', 'int'), ('docstring', 'str')],
+    'classes': [('file', 'int'), ('name', 'str'), ('qualname', 'str'), ('line', 'int'),
+                ('end_line', 'int'), ('docstring', 'str')],
+    'dependencies': [('file', 'int'), ('name', 'str'), ('type', 'category'), ('line', 'int')],
+}
+
+_COUNTED = ('functions', 'classes', 'imports', 'dependencies')
+
+
+def _collect_rows(metadata: Dict) -> Dict[str, Dict[str, list]]:
+    tables = {table: {column: [] for column, _ in columns} for table, columns in SCHEMA.items()}
+    files = tables['files']
+    for index, file_data in enumerate(metadata['files']):
+        files['path'].append(file_data['path'])
+        files['language'].append(file_data['language'])
+        files['size'].append(file_data.get('size'))
+        files['lines'].append(file_data.get('lines'))
+        for key in _COUNTED:
+            files[key].append(len(file_data.get(key) or ()))
+
+        for table in ('functions', 'classes', 'dependencies'):
+            columns = tables[table]
+            for symbol in file_data.get(table) or ():
+                columns['file'].append(index)
+                for column, _ in SCHEMA[table][1:]:
+                    columns[column].append(symbol.get(column))
+    return tables
+
+
+def _encode_column(values: list, kind: str) -> Dict[str, Union[bytes, list]]:
+    """Encode one column into named byte regions (plus category values)."""
+    regions = {}
+    if any(value is None for value in values):
+        regions['nulls'] = bytes(value is None for value in values)
+
+    if kind == 'int':
+        regions['data'] = array('q', (value if isinstance(value, int) else 0 for value in values)).tobytes()
+    elif kind == 'category':
+        codes = {}
+        regions['data'] = array('i', (codes.setdefault('' if v is None else str(v), len(codes))
+                                      for v in values)).tobytes()
+        regions['values'] = list(codes)
+    else:
+        offsets = array('q', [0])
+        blob = bytearray()
+        for value in values:
+            if value is not None:
+                blob += str(value).encode('utf-8', errors='surrogatepass')
+            offsets.append(len(blob))
+        regions['offsets'] = offsets.tobytes()
+        regions['data'] = bytes(blob)
+    return regions
+
+
+def write_columnar_metadata(metadata: Dict, path: str) -> str:
+    """Write parse_codebase metadata as a columnar file at path and return path.
+
+    The file is a small JSON header (schema, row counts, byte offsets of
+    every column region) followed by 8-byte aligned little-endian arrays,
+    so ColumnarMetadata can map it and read single columns lazily.
+    """
+    if sys.byteorder != 'little':
+        raise Exception("Columnar metadata is only supported on little-endian hosts")
+
+    header = {'tables': {}, 'language_stats': metadata.get('language_stats', {}),
+              'total_files': metadata.get('total_files', 0), 'total_lines': metadata.get('total_lines', 0)}
+    chunks = []
+    position = 0
+    for table, columns in _collect_rows(metadata).items():
+        table_header = {'rows': len(columns['path' if table == 'files' else 'file']), 'columns': {}}
+        for column, kind in SCHEMA[table]:
+            regions = _encode_column(columns[column], kind)
+            column_header = {'kind': kind}
+            if 'values' in regions:
+                column_header['values'] = regions.pop('values')
+            for region, data in regions.items():
+                column_header[region] = [position, len(data)]
+                padding = -len(data) % _ALIGN
+                chunks.append(data + b'\0' * padding)
+                position += len(data) + padding
+            table_header['columns'][column] = column_header
+        header['tables'][table] = table_header
+
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (-(len(header_bytes) + _HEADER.size) % _ALIGN)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
+
+
+class Column(Sequence):
+    """Lazy, read-only view of one column of a ColumnarMetadata table.
+
+    Integer and category columns index straight into the memory map; string
+    values are decoded one at a time on access.
+    """
+
+    def __init__(self, buffer: memoryview, base: int, rows: int, spec: Dict):
+        self.kind = spec['kind']
+        self._rows = rows
+        self._nulls = self._region(buffer, base, spec.get('nulls'))
+        data = self._region(buffer, base, spec['data'])
+        if self.kind == 'int':
+            self._data = data.cast('q')
+        elif self.kind == 'category':
+            self._data = data.cast('i')
+            self._values = spec['values']
+        else:
+            self._data = data
+            self._offsets = self._region(buffer, base, spec['offsets']).cast('q')
+
+    @staticmethod
+    def _region(buffer: memoryview, base: int, region: Optional[List[int]]) -> Optional[memoryview]:
+        if region is None:
+            return None
+        start = base + region[0]
+        return buffer[start:start + region[1]]
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError(index)
+        if self._nulls is not None and self._nulls[index]:
+            return None
+        if self.kind == 'int':
+            return self._data[index]
+        if self.kind == 'category':
+            return self._values[self._data[index]]
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8', errors='surrogatepass')
+
+    def release(self) -> None:
+        """Drop the views into the memory map so it can be closed."""
+        for view in (self._nulls, self._data, getattr(self, '_offsets', None)):
+            if view is not None:
+                view.release()
+
+
+class ColumnarMetadata:
+    """Memory-mapped reader for files written by write_columnar_metadata.
+
+    Only the header is parsed on open. Columns are mapped on first use and
+    ``select`` reads just the filter and projected columns, e.g.::
+
+        with ColumnarMetadata('output/metadata.cols') as store:
+            java = set(store.rows('files', {'language': 'java'}))
+            classes = store.select('classes', ['name', 'file'], {'file': java.__contains__})
+            big = store.select('files', ['path', 'lines'], {'lines': lambda n: n > 1000})
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            magic, header_length = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise Exception(f"{path} is not a columnar metadata file")
+            header = json.loads(self._file.read(header_length))
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._buffer = memoryview(self._map)
+        self._base = _HEADER.size + header_length
+        self._tables = header.pop('tables')
+        self.summary = header
+        self._columns: Dict[tuple, Column] = {}
+
+    def __enter__(self) -> 'ColumnarMetadata':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release all column views and unmap the file."""
+        for column in self._columns.values():
+            column.release()
+        self._columns.clear()
+        self._buffer.release()
+        self._map.close()
+        self._file.close()
+
+    @property
+    def tables(self) -> List[str]:
+        """Names of the stored tables."""
+        return list(self._tables)
+
+    def columns(self, table: str) -> List[str]:
+        """Column names of a table."""
+        return list(self._tables[table]['columns'])
+
+    def num_rows(self, table: str) -> int:
+        """Number of rows in a table."""
+        return self._tables[table]['rows']
+
+    def column(self, table: str, name: str) -> Column:
+        """Return a lazy Column view, mapping it on first use."""
+        key = (table, name)
+        if key not in self._columns:
+            spec = self._tables[table]['columns'][name]
+            self._columns[key] = Column(self._buffer, self._base, self._tables[table]['rows'], spec)
+        return self._columns[key]
+
+    def rows(self, table: str, where: Optional[Dict] = None) -> List[int]:
+        """Return indexes of rows matching every condition in where.
+
+        Conditions map a column to a value (equality) or a predicate callable.
+        """
+        candidates: Iterable[int] = range(self.num_rows(table))
+        for name, condition in (where or {}).items():
+            column = self.column(table, name)
+            if callable(condition):
+                candidates = [i for i in candidates if condition(column[i])]
+            else:
+                candidates = [i for i in candidates if column[i] == condition]
+        return list(candidates)
+
+    def select(self, table: str, columns: Optional[List[str]] = None, where: Optional[Dict] = None) -> List[Dict]:
+        """Materialise matching rows as dicts holding only the projected columns."""
+        names = columns or self.columns(table)
+        views = [self.column(table, name) for name in names]
+        return [{name: view[i] for name, view in zip(names, views)} for i in self.rows(table, where)]
@@ -0,0 +1,176 @@
+# core/file_metadata.py
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+# Values of these keys (and of 'name'/'type' inside symbols) repeat across
+# thousands of files, so they are interned.
+_INTERNED_LIST_KEYS = frozenset(['imports', 'exports', 'java_imports', 'jsp_includes', 'jsp_tags',
+                                 'css_imports', 'resource_links', 'methods', 'args'])
+_INTERNED_SYMBOL_KEYS = frozenset(['name', 'type', 'language'])
+
+
+class Record(Mapping):
+    """Read-mostly, slotted, dict-compatible record for one parsed symbol.
+
+    Concrete classes are created per field tuple by record_type; existing
+    fields can be reassigned with ``record[key] = value``.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def copy(self) -> Dict:
+        """Return a shallow, mutable dict copy (like dict.copy)."""
+        return dict(self.items())
+
+    def __reduce__(self):
+        return _make_record, (self._fields, tuple(getattr(self, f) for f in self._fields))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+_RECORD_TYPES: Dict[Tuple[str, ...], type] = {}
+
+
+def record_type(fields: Tuple[str, ...]) -> type:
+    """Return the (cached) Record subclass with exactly these fields."""
+    cls = _RECORD_TYPES.get(fields)
+    if cls is None:
+        cls = type('Record', (Record,), {'__slots__': fields, '_fields': fields})
+        _RECORD_TYPES[fields] = cls
+    return cls
+
+
+def _make_record(fields: Tuple[str, ...], values: Tuple) -> Record:
+    record = record_type(fields).__new__(record_type(fields))
+    for field, value in zip(fields, values):
+        setattr(record, field, value)
+    return record
+
+
+def _compact_value(key: str, value: Any) -> Any:
+    if isinstance(value, list):
+        if key in _INTERNED_LIST_KEYS:
+            return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+        if value and all(isinstance(v, dict) and all(k.isidentifier() for k in v) for v in value):
+            return tuple(compact_symbol(v) for v in value)
+        return tuple(value)
+    if isinstance(value, dict) and key == 'tags':
+        return {sys.intern(k): v for k, v in value.items()}
+    return value
+
+
+def compact_symbol(symbol: Dict) -> Record:
+    """Convert one function/class/dependency dict into a slotted Record."""
+    fields = tuple(symbol)
+    return _make_record(fields, tuple(
+        sys.intern(v) if k in _INTERNED_SYMBOL_KEYS and isinstance(v, str) else _compact_value(k, v)
+        for k, v in symbol.items()
+    ))
+
+
+class FileMetadata(Mapping):
+    """Compact, dict-compatible replacement for one entry of metadata['files'].
+
+    Common keys live in slots, symbol lists become tuples of Records and
+    import/dependency names are interned. Language-specific keys (tables,
+    jsp_tags, tags, ...) go into a small overflow dict. Supports the read
+    API of dict plus item assignment, so DependencyGraphBuilder, LLMClient
+    and StructuredDocumentationGenerator keep working unchanged.
+    """
+
+    __slots__ = ('path', 'language', 'size', 'lines', 'functions', 'classes',
+                 'imports', 'exports', 'dependencies', '_extra')
+    _FIELDS = __slots__[:-1]
+
+    def __init__(self, **fields: Any):
+        self._extra = None
+        for field in self._FIELDS:
+            setattr(self, field, None)
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, file_metadata: Dict) -> 'FileMetadata':
+        """Build a compact FileMetadata from a parser result dict."""
+        if isinstance(file_metadata, cls):
+            return file_metadata
+        return cls(**{key: _compact_value(key, value) for key, value in file_metadata.items()})
+
+    def to_dict(self) -> Dict:
+        """Return a plain, JSON-serialisable dict copy."""
+        return to_builtin(self)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELDS:
+            setattr(self, key, sys.intern(value) if key == 'language' else value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self._FIELDS:
+            if getattr(self, field) is not None:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict:
+        """Return a shallow, mutable dict copy (like dict.copy)."""
+        return dict(self.items())
+
+    def __getstate__(self):
+        return {key: self[key] for key in self}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(**state)
+
+    def __repr__(self) -> str:
+        return f"FileMetadata({self.path!r}, {self.language!r})"
+
+
+def to_builtin(value: Any) -> Any:
+    """Recursively convert FileMetadata/Records/tuples back to dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(item) for item in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """``default`` hook for json.dump that understands compact metadata."""
+    if isinstance(value, Mapping):
+        return to_builtin(value)
+    return str(value)
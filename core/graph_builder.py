@@ -9,36 +9,65 @@ import os
 class DependencyGraphBuilder:
     def __init__(self):
         self.graph = nx.DiGraph()
+        self._file_map = {}
+        self._pending_dependencies = []
+        self.unresolved_dependencies = []
         
     def build_dependency_graph(self, metadata: Dict) -> nx.DiGraph:
         """Build improved dependency graph from parsed metadata."""
-        self.graph.clear()
+        self.reset()
         
-        # Create file mapping for better resolution
-        file_map = {}
         for file_data in metadata['files']:
-            path = file_data['path']
-            filename = os.path.basename(path)
-            name_without_ext = os.path.splitext(filename)[0]
-            
-            # Add to file mapping
-            file_map[path] = file_data
-            file_map[filename] = file_data
-            file_map[name_without_ext] = file_data
+            self.add_file(file_data)
         
-        # Add nodes for all files
-        for file_data in metadata['files']:
-            file_path = file_data['path']
-            self.graph.add_node(file_path, **file_data)
+        return self.resolve_dependencies()
+    
+    def reset(self) -> None:
+        """Clear the graph and any files added so far."""
+        self.graph.clear()
+        self._file_map = {}
+        self._pending_dependencies = []
+        self.unresolved_dependencies = []
+    
+    def add_file(self, file_data: Dict) -> None:
+        """Add one parsed file as a node; its dependencies resolve in resolve_dependencies.
+
+        Lets the graph be built while CodebaseParser.iter_file_metadata streams files.
+        """
+        path = file_data['path']
+        filename = os.path.basename(path)
+        name_without_ext = os.path.splitext(filename)[0]
+        
+        self.graph.add_node(path, **file_data)
+        node_data = self.graph.nodes[path]
+        
+        # Add to file mapping for better resolution
+        self._file_map[path] = node_data
+        self._file_map[filename] = node_data
+        self._file_map[name_without_ext] = node_data
+        
+        self.add_dependencies(path, file_data.get('dependencies', []))
+    
+    def add_dependencies(self, path: str, dependencies: List[Dict]) -> None:
+        """Queue dependencies of an added file for resolve_dependencies."""
+        self._pending_dependencies.append((path, dependencies))
+    
+    def get_edges(self) -> List[List]:
+        """Edges as [source, target, type, name, line] lists."""
+        return [[source, target, data['dependency_type'], data['dependency_name'], data['line_number']]
+                for source, target, data in self.graph.edges(data=True)]
+    
+    def resolve_dependencies(self) -> nx.DiGraph:
+        """Add edges for all dependencies of the files added since reset."""
+        files = {'files': [self.graph.nodes[node] for node in self.graph.nodes()]}
         
         # Add edges for dependencies with improved resolution
-        for file_data in metadata['files']:
-            current_file = file_data['path']
-            dependencies = file_data.get('dependencies', [])
-            
+        for current_file, dependencies in self._pending_dependencies:
             for dep in dependencies:
                 dep_name = dep['name']
-                resolved_files = self._resolve_dependency(dep_name, current_file, file_map, metadata)
+                resolved_files = self._resolve_dependency(dep_name, current_file, self._file_map, files)
+                if all(resolved_file == current_file for resolved_file in resolved_files):
+                    self.unresolved_dependencies.append((current_file, dep))
                 
                 for resolved_file in resolved_files:
                     if resolved_file != current_file:  # Avoid self-references
@@ -50,6 +79,7 @@ class DependencyGraphBuilder:
                             line_number=dep.get('line', 0)
                         )
         
+        self._pending_dependencies = []
         return self.graph
     
     def _resolve_dependency(self, dep_name: str, current_file: str, file_map: Dict, metadata: Dict) -> List[str]:
@@ -48,6 +48,16 @@ class LLMClient:
         languages = list(metadata['language_stats'].keys())
         project_structure = metadata.get('project_structure', {})
         
+        # Sampled runs keep only the parsed files; the structure counts are estimates
+        sampling = metadata.get('sampling')
+        if sampling:
+            structure_counts = sampling['project_structure']
+            sampling_note = (f"- Note: counts are estimated from a stratified sample of "
+                             f"{sampling['sampled_files']} of {sampling['candidate_files']} files")
+        else:
+            structure_counts = {category: len(files) for category, files in project_structure.items()}
+            sampling_note = ""
+        
         # Determine project type and tech stack
         project_type = self._determine_project_type(metadata)
         tech_stack = self._analyze_tech_stack(metadata)
@@ -67,16 +77,17 @@ class LLMClient:
         - Total Lines: {metadata['total_lines']:,}
         - Languages: {languages}
         - Project Type: {project_type}
+        {sampling_note}
         
         ## Language Distribution:
         {json.dumps(metadata['language_stats'], indent=2)}
         
         ## Project Structure Analysis:
-        - Web Files: {len(project_structure.get('web_files', []))}
-        - Backend Files: {len(project_structure.get('backend_files', []))}
-        - Database Files: {len(project_structure.get('database_files', []))}
-        - Config Files: {len(project_structure.get('config_files', []))}
-        - Test Files: {len(project_structure.get('test_files', []))}
+        - Web Files: {structure_counts.get('web_files', 0)}
+        - Backend Files: {structure_counts.get('backend_files', 0)}
+        - Database Files: {structure_counts.get('database_files', 0)}
+        - Config Files: {structure_counts.get('config_files', 0)}
+        - Test Files: {structure_counts.get('test_files', 0)}
         
         ## Technology Stack Detected:
         {json.dumps(tech_stack, indent=2)}
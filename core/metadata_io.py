@@ -0,0 +1,71 @@
+# core/metadata_io.py
+import json
+from typing import IO, Dict
+
+from core.file_metadata import json_default
+
+# Version 1 (no 'format_version' key) stored full file dicts in every
+# project_structure bucket. Version 2 stores indexes into metadata['files'].
+METADATA_FORMAT_VERSION = 2
+
+
+def dereference_project_structure(metadata: Dict) -> Dict:
+    """Return project_structure with each file replaced by its index in metadata['files'].
+
+    Bucket entries may be file dicts (matched by identity, then by path) or
+    plain paths, as produced by MetadataAggregator(keep_files=False).
+    """
+    files = metadata.get('files', [])
+    index_by_id = {id(file_data): index for index, file_data in enumerate(files)}
+    index_by_path = {file_data['path']: index for index, file_data in enumerate(files)}
+
+    structure = {}
+    for category, entries in metadata.get('project_structure', {}).items():
+        indexes = []
+        for entry in entries:
+            if isinstance(entry, str):
+                index = index_by_path.get(entry)
+            else:
+                index = index_by_id.get(id(entry), index_by_path.get(entry.get('path')))
+            if index is not None:
+                indexes.append(index)
+        structure[category] = indexes
+    return structure
+
+
+def resolve_project_structure(metadata: Dict) -> Dict:
+    """Replace index entries in project_structure with the file dicts they refer to, in place."""
+    files = metadata.get('files', [])
+    for category, entries in metadata.get('project_structure', {}).items():
+        metadata['project_structure'][category] = [
+            files[entry] if isinstance(entry, int) else entry for entry in entries
+        ]
+    return metadata
+
+
+def dump_metadata_document(document: Dict, f: IO[str], indent: int = None) -> None:
+    """Write an agent metadata document ({'metadata': ..., ...}) in the v2 format.
+
+    Every file is serialised once; project_structure buckets hold indexes.
+    The document passed in is not modified.
+    """
+    metadata = document['metadata']
+    compact = dict(document)
+    compact['format_version'] = METADATA_FORMAT_VERSION
+    compact['metadata'] = dict(metadata)
+    compact['metadata']['project_structure'] = dereference_project_structure(metadata)
+    separators = (',', ':') if indent is None else None
+    json.dump(compact, f, indent=indent, separators=separators, default=json_default)
+
+
+def load_metadata_document(f: IO[str], resolve: bool = True) -> Dict:
+    """Read a metadata document written by any version of the agent.
+
+    With ``resolve`` (the default) v2 project_structure indexes are turned
+    back into file dicts, giving the same shape parse_codebase returns;
+    otherwise they are left as indexes for callers that only need counts.
+    """
+    document = json.load(f)
+    if resolve and document.get('format_version', 1) >= 2:
+        resolve_project_structure(document['metadata'])
+    return document
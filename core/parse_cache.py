@@ -0,0 +1,113 @@
+# core/parse_cache.py
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Optional, Union
+
+# Bump whenever a _parse_* method changes its output so stale entries are ignored.
+PARSER_VERSION = '10'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ai-code-docs', 'parse')
+
+
+class ParseCache:
+    """Content-addressed on-disk cache of per-file parse results.
+
+    Entries are keyed by the parser version, the language and a SHA-256 of the
+    file content, never by path, so one cache directory can be shared between
+    clones and forks of the same repository. Reads refresh the entry's mtime
+    and ``prune`` evicts the least recently used entries above ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, content: Union[str, bytes], language: str) -> str:
+        """Return the cache key for a file's content.
+
+        ``content`` is decoded text or the ASCII bytes it was read from;
+        both give the same key for the same text.
+        """
+        digest = hashlib.sha256(f"{PARSER_VERSION}\0{language}\0".encode('utf-8'))
+        digest.update(content if isinstance(content, bytes) else content.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def make_file_key(self, file_path: str, language: str, block_size: int = 1024 * 1024) -> str:
+        """Return the cache key for a file's raw bytes, hashed in bounded blocks.
+
+        Used for files too large to decode in memory; the key space is
+        separate from make_key.
+        """
+        digest = hashlib.sha256(f"{PARSER_VERSION}\0{language}\0bytes\0".encode('utf-8'))
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached metadata for key, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, file_metadata: Dict) -> None:
+        """Store file_metadata (without its path) under key."""
+        entry = {k: v for k, v in file_metadata.items() if k != 'path'}
+        entry_path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            pass
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits max_bytes.
+
+        Returns the number of entries removed.
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def get_statistics(self) -> Dict:
+        """Get hit and miss counts for this run."""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -1,15 +1,274 @@
 import os
-import re
 import ast
 import json
-from typing import Dict, List, Set, Tuple
+import time
+import random
+from typing import Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
+from collections import defaultdict
 import subprocess
 import tempfile
 import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 
-class CodebaseParser:
+from core.file_metadata import FileMetadata
+from core.parse_cache import ParseCache
+from core.path_matcher import PathMatcher
+from core.prefetch import ReadAheadReader
+from core.prefilter import FilePrefilter
+from core.profiler import ParseProfiler
+from core.scanners import (scan_css, scan_html, scan_html_file, scan_java, scan_javascript, scan_jsp,
+                           scan_sql, scan_sql_file)
+from core.treesitter_backend import TreeSitterBackend
+
+_worker_parser = None
+
+
+def _init_parse_worker(parser: 'CodebaseParser') -> None:
+    """Install the parser instance used by pool workers."""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_file_in_worker(index: int, file_path: str) -> Tuple[int, Dict, Dict]:
+    """Extract metadata for one file inside a pool worker.
+
+    Also returns the worker's run statistics for this file so the parent
+    can merge them.
+    """
+    _worker_parser.reset_run_statistics()
+    file_metadata = _worker_parser.extract_file_metadata(file_path)
+    return index, file_metadata, _worker_parser.get_run_statistics()
+
+
+class _PythonSymbolVisitor(ast.NodeVisitor):
+    """Collect defs, classes and imports from a module's statements only.
+
+    Only statement bodies are descended into; expressions are never visited.
+    Qualified names follow ``__qualname__`` (``Outer.method.<locals>.inner``).
+    """
+    
+    _BODY_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+    
     def __init__(self):
+        self.functions = []
+        self.classes = []
+        self.imports = []
+        self.dependencies = []
+        self._scope = []
+    
+    def generic_visit(self, node):
+        for field in self._BODY_FIELDS:
+            for child in getattr(node, field, ()):
+                self.visit(child)
+    
+    def _qualname(self, name: str) -> str:
+        return '.'.join(self._scope + [name])
+    
+    def _visit_function(self, node, is_async: bool):
+        self.functions.append({
+            'name': node.name,
+            'qualname': self._qualname(node.name),
+            'line': node.lineno,
+            'end_line': node.end_lineno,
+            'async': is_async,
+            'args': [arg.arg for arg in node.args.args],
+            'docstring': ast.get_docstring(node)
+        })
+        self._scope.extend([node.name, '<locals>'])
+        self.generic_visit(node)
+        del self._scope[-2:]
+    
+    def visit_FunctionDef(self, node):
+        self._visit_function(node, False)
+    
+    def visit_AsyncFunctionDef(self, node):
+        self._visit_function(node, True)
+    
+    def visit_ClassDef(self, node):
+        self.classes.append({
+            'name': node.name,
+            'qualname': self._qualname(node.name),
+            'line': node.lineno,
+            'end_line': node.end_lineno,
+            'docstring': ast.get_docstring(node),
+            'methods': [n.name for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        })
+        self._scope.append(node.name)
+        self.generic_visit(node)
+        self._scope.pop()
+    
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports.append(alias.name)
+            self.dependencies.append({
+                'type': 'import',
+                'name': alias.name,
+                'line': node.lineno
+            })
+    
+    def visit_ImportFrom(self, node):
+        module = node.module or ''
+        self.imports.append(module)
+        self.dependencies.append({
+            'type': 'from_import',
+            'name': module,
+            'line': node.lineno
+        })
+
+
+STRUCTURE_CATEGORIES = (
+    'web_files', 'backend_files', 'database_files',
+    'config_files', 'test_files', 'documentation_files'
+)
+
+
+def structure_category(file_data: Dict) -> Optional[str]:
+    """Return the project_structure bucket a parsed file belongs to, if any."""
+    path = file_data['path'].lower()
+    lang = file_data['language']
+    
+    if lang in ['html', 'css', 'javascript', 'jsp']:
+        return 'web_files'
+    elif lang in ['java', 'python']:
+        if 'test' in path or 'spec' in path:
+            return 'test_files'
+        return 'backend_files'
+    elif lang == 'sql':
+        return 'database_files'
+    elif lang in ['json', 'yaml', 'properties', 'xml'] or 'config' in path:
+        return 'config_files'
+    elif lang == 'markdown' or path.endswith('.md'):
+        return 'documentation_files'
+    return None
+
+
+def allocate_sample(counts: Dict, budget: int, first: Set = frozenset()) -> Dict:
+    """Split a file budget across strata in proportion to their sizes.
+
+    Every stratum gets at least one file while the budget lasts (strata in
+    ``first``, then the largest); the rest is shared out by largest
+    remainder, so the allocations always add up to min(budget, total).
+    """
+    total = sum(counts.values())
+    if budget >= total:
+        return dict(counts)
+    
+    by_size = sorted(counts, key=lambda key: (key not in first, -counts[key], key))
+    allocation = {key: 0 for key in counts}
+    for key in by_size[:budget]:
+        allocation[key] = 1
+    remaining = budget - sum(allocation.values())
+    if remaining <= 0:
+        return allocation
+    
+    spare = {key: counts[key] - allocation[key] for key in counts}
+    spare_total = sum(spare.values())
+    shares = {key: remaining * spare[key] / spare_total for key in counts}
+    for key in counts:
+        allocation[key] += int(shares[key])
+    leftover = budget - sum(allocation.values())
+    for key in sorted(counts, key=lambda key: (int(shares[key]) - shares[key], key))[:leftover]:
+        allocation[key] += 1
+    return allocation
+
+
+class MetadataAggregator:
+    """Incrementally build the parse_codebase metadata dict from streamed files.
+
+    With ``keep_files=False`` the file dicts are not retained: ``files`` stays
+    empty and the project_structure buckets hold paths, so memory does not
+    grow with the size of the repository. With ``compact=True`` retained
+    files are stored as slotted FileMetadata objects instead of dicts.
+    """
+    
+    def __init__(self, keep_files: bool = True, metadata: Dict = None, compact: bool = False):
+        self.keep_files = keep_files
+        self.compact = compact
+        self.metadata = metadata if metadata is not None else {
+            'files': [],
+            'language_stats': {},
+            'total_files': 0,
+            'total_lines': 0,
+            'project_structure': {category: [] for category in STRUCTURE_CATEGORIES}
+        }
+    
+    def add(self, file_metadata: Dict) -> None:
+        """Add one parsed file."""
+        if self.compact and self.keep_files:
+            file_metadata = FileMetadata.from_dict(file_metadata)
+        if self.keep_files:
+            self.metadata['files'].append(file_metadata)
+        self.metadata['total_files'] += 1
+        self.add_stats(file_metadata)
+        
+        category = structure_category(file_metadata)
+        if category:
+            entry = file_metadata if self.keep_files else file_metadata['path']
+            self.metadata['project_structure'][category].append(entry)
+    
+    def add_stats(self, file_metadata: Dict) -> None:
+        """Add a file's counts to language_stats and total_lines."""
+        lang = file_metadata['language']
+        if lang not in self.metadata['language_stats']:
+            self.metadata['language_stats'][lang] = {'files': 0, 'lines': 0}
+        
+        self.metadata['language_stats'][lang]['files'] += 1
+        self.metadata['language_stats'][lang]['lines'] += file_metadata['lines']
+        self.metadata['total_lines'] += file_metadata['lines']
+    
+    def remove_stats(self, file_metadata: Dict) -> None:
+        """Subtract a file's counts from language_stats and total_lines."""
+        lang = file_metadata['language']
+        stats = self.metadata['language_stats'][lang]
+        stats['files'] -= 1
+        stats['lines'] -= file_metadata['lines']
+        if stats['files'] == 0:
+            del self.metadata['language_stats'][lang]
+        self.metadata['total_lines'] -= file_metadata['lines']
+    
+    def get_metadata(self) -> Dict:
+        """Return the aggregated metadata."""
+        return self.metadata
+
+
+class CodebaseParser:
+    def __init__(self, jobs: int = 1, cache: ParseCache = None, prefilter: FilePrefilter = None,
+                 compact: bool = False, prefetch: int = 0, backend: str = 'regex'):
+        self.jobs = jobs
+        # 'tree-sitter' parses Java/JS/TS with tree-sitter when it is installed,
+        # falling back to the regex scanners per language. Each path is parsed
+        # once per run, so no trees are cached for incremental reparsing.
+        self.tree_sitter = TreeSitterBackend(max_cached_trees=0) if backend == 'tree-sitter' else None
+        # Read-ahead threads for serial parsing; 0 reads each file when it is parsed
+        self.prefetch = prefetch
+        self.cache = cache
+        self.prefilter = prefilter
+        # Keep parse_codebase results as interned, slotted FileMetadata objects
+        self.compact = compact
+        self.profiler = ParseProfiler()
+        
+        # Parser method per language, called with the file content and path
+        self.parsers = {
+            'python': '_parse_python',
+            'javascript': '_parse_javascript',
+            'typescript': '_parse_javascript',
+            'java': '_parse_java',
+            'jsp': '_parse_jsp',
+            'html': '_parse_html',
+            'css': '_parse_css',
+            'sql': '_parse_sql',
+        }
+        # Languages with a bounded-memory file parser used above large_file_threshold
+        self.streaming_parsers = {'sql': '_parse_sql_file', 'html': '_parse_html_file'}
+        # Languages whose parsers scan bytes; pure-ASCII files skip decoding entirely
+        self.bytes_languages = {'javascript', 'typescript', 'jsp', 'html', 'css', 'sql'}
+        self.large_file_threshold = 32 * 1024 * 1024
+        # Per-language overrides; generated HTML reports are often several MB
+        self.streaming_thresholds = {'html': 4 * 1024 * 1024}
+        self.clone_stats = {}
+        self._ignore_matcher = None
+        self._ignore_matcher_key = None
         self.supported_languages = {
             '.py': 'python',
             '.js': 'javascript', 
@@ -41,426 +300,740 @@ class CodebaseParser:
             '*.pyd', '*.so', '*.dll', '*.class', '*.jar'
         }
     
-    def clone_repository(self, github_url: str) -> str:
-        """Clone GitHub repository to temporary directory."""
+    def clone_repository(self, github_url: str, fast: bool = False) -> str:
+        """Clone GitHub repository to temporary directory.
+
+        With ``fast`` the clone is depth-1, blob-filtered and sparse: only files
+        with a supported extension outside ignore_patterns are checked out.
+        Timing and transfer size are recorded in ``self.clone_stats``.
+        """
         temp_dir = tempfile.mkdtemp()
+        start = time.perf_counter()
         try:
-            subprocess.run(['git', 'clone', github_url, temp_dir], 
-                         check=True, capture_output=True, text=True)
-            return temp_dir
+            if fast:
+                subprocess.run(['git', 'clone', '--depth', '1', '--filter=blob:none', '--no-checkout',
+                                github_url, temp_dir],
+                               check=True, capture_output=True, text=True)
+                subprocess.run(['git', '-C', temp_dir, 'sparse-checkout', 'set', '--no-cone', '--stdin'],
+                               input='\n'.join(self._sparse_checkout_patterns()) + '\n',
+                               check=True, capture_output=True, text=True)
+                subprocess.run(['git', '-C', temp_dir, 'checkout'],
+                               check=True, capture_output=True, text=True)
+            else:
+                subprocess.run(['git', 'clone', github_url, temp_dir], 
+                             check=True, capture_output=True, text=True)
         except subprocess.CalledProcessError as e:
             raise Exception(f"Failed to clone repository: {e}")
+        
+        self.clone_stats = {
+            'mode': 'fast' if fast else 'full',
+            'seconds': round(time.perf_counter() - start, 2),
+            'bytes': self._directory_size(os.path.join(temp_dir, '.git'))
+        }
+        return temp_dir
+    
+    def fetch_commit(self, repo_path: str, commit: str) -> None:
+        """Fetch a single commit into a shallow clone so it can be diffed against."""
+        try:
+            subprocess.run(['git', '-C', repo_path, 'fetch', '--depth', '1', '--filter=blob:none',
+                            'origin', commit],
+                           check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to fetch commit {commit}: {e.stderr.strip()}")
+    
+    def _sparse_checkout_patterns(self) -> List[str]:
+        """Build non-cone sparse-checkout patterns from supported_languages and ignore_patterns."""
+        patterns = [f'*{ext}' for ext in sorted(self.supported_languages)]
+        for pattern in sorted(self.ignore_patterns):
+            patterns.append(f'!{pattern}' if pattern.startswith('*') else f'!**/{pattern}/**')
+        return patterns
+    
+    def _directory_size(self, path: str) -> int:
+        """Total size in bytes of all files under path."""
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+    
+    def get_head_commit(self, repo_path: str) -> Optional[str]:
+        """Return the commit SHA checked out in repo_path, if it is a git repository."""
+        try:
+            result = subprocess.run(['git', '-C', repo_path, 'rev-parse', 'HEAD'],
+                                    check=True, capture_output=True, text=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.strip()
+    
+    def compile_path_matcher(self, repo_path: str) -> PathMatcher:
+        """Compile ignore_patterns plus the repository's .gitignore files for one run."""
+        return PathMatcher(repo_path, self.ignore_patterns)
     
     def should_ignore_path(self, path: str) -> bool:
-        """Check if path should be ignored based on patterns."""
-        path_parts = Path(path).parts
-        for part in path_parts:
-            if any(pattern in part or part.startswith('.') and pattern.startswith('.') 
-                   for pattern in self.ignore_patterns):
-                return True
-        return False
+        """Check if path should be ignored based on patterns.
+
+        Uses glob semantics on each path component but not .gitignore files;
+        walks use compile_path_matcher instead.
+        """
+        key = frozenset(self.ignore_patterns)
+        if self._ignore_matcher_key != key:
+            self._ignore_matcher = PathMatcher(None, self.ignore_patterns)
+            self._ignore_matcher_key = key
+        return self._ignore_matcher.is_ignored(path)
     
     def classify_language(self, file_path: str) -> str:
         """Classify file language based on extension."""
         ext = Path(file_path).suffix.lower()
         return self.supported_languages.get(ext, 'unknown')
     
-    def extract_file_metadata(self, file_path: str) -> Dict:
-        """Extract metadata from a single file."""
+    def extract_file_metadata(self, file_path: str, data: Optional[bytes] = None) -> Dict:
+        """Extract metadata from a single file.
+
+        ``data`` is the file's content already read by _prefetch_file; when
+        None the file is read here.
+        """
+        language = self.classify_language(file_path)
+        if language == 'unknown':
+            if self.prefilter:
+                self.prefilter.check(file_path)
+            return None
+        
+        if self.prefilter:
+            start = time.perf_counter()
+            if data is None:
+                rejected = self.prefilter.check(file_path)
+            else:
+                rejected = self.prefilter.check(file_path, size=len(data), head=data[:self.prefilter.sniff_bytes])
+            self.profiler.add_phase('prefilter', time.perf_counter() - start)
+            if rejected:
+                return None
+        
+        if language in self.streaming_parsers and data is None:
+            try:
+                if os.path.getsize(file_path) > self._streaming_threshold(language):
+                    start = time.perf_counter()
+                    metadata = self._extract_large_file_metadata(file_path, language)
+                    if metadata:
+                        self.profiler.record(file_path, language, metadata['size'], 0.0,
+                                             time.perf_counter() - start)
+                    return metadata
+            except OSError:
+                return None
+        
+        start = time.perf_counter()
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            if data is None:
+                data = self._read_bytes(file_path)
+            content = self._content(language, data)
         except Exception:
             return None
+        read_done = time.perf_counter()
+        
+        cache_key = None
+        if self.cache:
+            cache_language = language
+            if self.tree_sitter and self.tree_sitter.supports(language, file_path):
+                cache_language += '+tree-sitter'
+            cache_key = self.cache.make_key(content, cache_language)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached['path'] = file_path
+                self.profiler.record(file_path, language, len(content), read_done - start,
+                                     time.perf_counter() - read_done, cached=True)
+                return cached
             
+        metadata = {
+            'path': file_path,
+            'language': language,
+            'size': len(content),
+            'lines': self._count_lines(content),
+            'functions': [],
+            'classes': [],
+            'imports': [],
+            'exports': [],
+            'dependencies': []  # Enhanced for better dependency tracking
+        }
+        
+        if language in self.parsers:
+            metadata.update(getattr(self, self.parsers[language])(content, file_path))
+        
+        if cache_key:
+            self.cache.put(cache_key, metadata)
+        
+        self.profiler.record(file_path, language, len(content), read_done - start, time.perf_counter() - read_done)
+        return metadata
+    
+    def _read_bytes(self, file_path: str, sniff: bool = False) -> Optional[bytes]:
+        """Read a file's raw bytes; the single place source files are read.
+
+        With ``sniff`` only the pre-filter's sniff prefix is read first, and
+        None is returned without reading the rest if the sniff rejects it.
+        """
+        with open(file_path, 'rb') as f:
+            if not sniff:
+                return f.read()
+            head = f.read(self.prefilter.sniff_bytes)
+            if self.prefilter.head_rejection(file_path, head):
+                return None
+            return head + f.read()
+    
+    def _content(self, language: str, data: bytes) -> Union[str, bytes]:
+        """What the language's parser is given for a file's raw bytes.
+
+        Line endings are normalised; ASCII files of bytes_languages stay as
+        the buffer that was read (names are decoded as they are emitted),
+        everything else is decoded.
+        """
+        if b'\r' in data:
+            data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        if language in self.bytes_languages and data.isascii():
+            return data
+        return self._decode(data)
+    
+    @staticmethod
+    def _count_lines(content: Union[str, bytes]) -> int:
+        """Number of lines in str or bytes content, counting a final line without a newline."""
+        newline = b'\n' if isinstance(content, bytes) else '\n'
+        lines = content.count(newline)
+        return lines + 1 if content and not content.endswith(newline) else lines
+    
+    @staticmethod
+    def _count_file_lines(file_path: str, block_size: int = 1024 * 1024) -> int:
+        """Count a file's lines like _count_lines without parsing it, reading one block at a time."""
+        lines = 0
+        last = b''
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(block_size), b''):
+                    lines += block.count(b'\n')
+                    last = block
+        except OSError:
+            return 0
+        return lines + 1 if last and not last.endswith(b'\n') else lines
+    
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        """Decode like open(..., 'r', encoding='utf-8', errors='ignore'), universal newlines included."""
+        content = data.decode('utf-8', errors='ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    def _prefetch_file(self, file_path: str) -> Optional[bytes]:
+        """Read-ahead stage: return the bytes extract_file_metadata would read, or None.
+
+        Runs in reader threads, so it only stats and reads and leaves the
+        pre-filter counters to extract_file_metadata. Files that will be
+        skipped without reading (unknown language, rejected by name, over
+        the size cap) or that take the streaming path return None, and so
+        do files rejected by the sniff, of which only the prefix is read.
+        """
         language = self.classify_language(file_path)
         if language == 'unknown':
             return None
-            
+        if self.prefilter and self.prefilter.name_rejection(file_path):
+            return None
+        try:
+            size = os.path.getsize(file_path)
+            if language in self.streaming_parsers and size > self._streaming_threshold(language):
+                return None
+            if self.prefilter and self.prefilter.exceeds_size(file_path, size):
+                return None
+            return self._read_bytes(file_path, sniff=self.prefilter is not None)
+        except OSError:
+            return None
+    
+    def _streaming_threshold(self, language: str) -> int:
+        """Size above which a streaming language is parsed with its file parser."""
+        return self.streaming_thresholds.get(language, self.large_file_threshold)
+    
+    def _extract_large_file_metadata(self, file_path: str, language: str) -> Dict:
+        """Extract metadata without reading the whole file into memory."""
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_file_key(file_path, language)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached['path'] = file_path
+                return cached
+        
+        try:
+            parsed = getattr(self, self.streaming_parsers[language])(file_path)
+        except (OSError, ValueError):
+            return None
+        
         metadata = {
             'path': file_path,
             'language': language,
-            'size': len(content),
-            'lines': len(content.splitlines()),
+            'size': parsed.pop('size'),
+            'lines': parsed.pop('lines'),
             'functions': [],
             'classes': [],
             'imports': [],
             'exports': [],
-            'dependencies': []  # Enhanced for better dependency tracking
+            'dependencies': []
         }
+        metadata.update(parsed)
+        
+        if cache_key:
+            self.cache.put(cache_key, metadata)
         
-        if language == 'python':
-            metadata.update(self._parse_python(content, file_path))
-        elif language in ['javascript', 'typescript']:
-            metadata.update(self._parse_javascript(content, file_path))
-        elif language == 'java':
-            metadata.update(self._parse_java(content, file_path))
-        elif language == 'jsp':
-            metadata.update(self._parse_jsp(content, file_path))
-        elif language == 'html':
-            metadata.update(self._parse_html(content, file_path))
-        elif language == 'css':
-            metadata.update(self._parse_css(content, file_path))
-        elif language == 'sql':
-            metadata.update(self._parse_sql(content, file_path))
-            
         return metadata
     
     def _parse_python(self, content: str, file_path: str) -> Dict:
-        """Parse Python file for functions, classes, imports."""
+        """Parse Python file for functions (including async), classes, imports."""
         try:
             tree = ast.parse(content)
         except:
             return {'functions': [], 'classes': [], 'imports': [], 'dependencies': []}
-            
-        functions = []
-        classes = []
-        imports = []
-        dependencies = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append({
-                    'name': node.name,
-                    'line': node.lineno,
-                    'args': [arg.arg for arg in node.args.args],
-                    'docstring': ast.get_docstring(node)
-                })
-            elif isinstance(node, ast.ClassDef):
-                classes.append({
-                    'name': node.name,
-                    'line': node.lineno,
-                    'docstring': ast.get_docstring(node),
-                    'methods': [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                })
-            elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                        dependencies.append({
-                            'type': 'import',
-                            'name': alias.name,
-                            'line': node.lineno
-                        })
-                else:
-                    module = node.module or ''
-                    imports.append(module)
-                    dependencies.append({
-                        'type': 'from_import',
-                        'name': module,
-                        'line': node.lineno
-                    })
-                    
-        return {'functions': functions, 'classes': classes, 'imports': imports, 'dependencies': dependencies}
-    
-    def _parse_javascript(self, content: str, file_path: str) -> Dict:
-        """Parse JavaScript/TypeScript for functions, classes, imports."""
-        functions = []
-        classes = []
-        imports = []
-        exports = []
-        dependencies = []
-        
-        # Enhanced regex patterns
-        func_pattern = r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s+)?(?:\([^)]*\)\s*=>|\([^)]*\)\s*{)|(\w+)\s*:\s*function)'
-        class_pattern = r'class\s+(\w+)'
-        import_pattern = r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]|require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
-        export_pattern = r'export\s+(?:default\s+)?(?:function\s+(\w+)|class\s+(\w+)|const\s+(\w+))'
-        
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            # Functions
-            func_matches = re.finditer(func_pattern, line)
-            for match in func_matches:
-                name = match.group(1) or match.group(2) or match.group(3)
-                if name:
-                    functions.append({'name': name, 'line': i + 1})
-            
-            # Classes
-            class_matches = re.finditer(class_pattern, line)
-            for match in class_matches:
-                classes.append({'name': match.group(1), 'line': i + 1})
-            
-            # Imports
-            import_matches = re.finditer(import_pattern, line)
-            for match in import_matches:
-                imp_name = match.group(1) or match.group(2)
-                if imp_name:
-                    imports.append(imp_name)
-                    dependencies.append({
-                        'type': 'import',
-                        'name': imp_name,
-                        'line': i + 1
-                    })
-            
-            # Exports
-            export_matches = re.finditer(export_pattern, line)
-            for match in export_matches:
-                name = match.group(1) or match.group(2) or match.group(3)
-                if name:
-                    exports.append(name)
         
-        return {'functions': functions, 'classes': classes, 'imports': imports, 'exports': exports, 'dependencies': dependencies}
-    
-    def _parse_java(self, content: str, file_path: str) -> Dict:
-        """Parse Java for classes, methods, imports."""
-        functions = []
-        classes = []
-        imports = []
-        dependencies = []
-        
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            # Java class pattern
-            class_match = re.search(r'(?:public\s+)?(?:abstract\s+)?class\s+(\w+)', line)
-            if class_match:
-                classes.append({'name': class_match.group(1), 'line': i + 1})
-            
-            # Java method pattern
-            method_match = re.search(r'(?:public|private|protected)?\s*(?:static\s+)?(?:\w+\s+)+(\w+)\s*\([^)]*\)\s*{', line)
-            if method_match:
-                functions.append({'name': method_match.group(1), 'line': i + 1})
-            
-            # Java import pattern
-            import_match = re.search(r'import\s+([^;]+);', line)
-            if import_match:
-                imp_name = import_match.group(1).strip()
-                imports.append(imp_name)
-                dependencies.append({
-                    'type': 'import',
-                    'name': imp_name,
-                    'line': i + 1
-                })
-        
-        return {'functions': functions, 'classes': classes, 'imports': imports, 'dependencies': dependencies}
-    
-    def _parse_jsp(self, content: str, file_path: str) -> Dict:
-        """Parse JSP files for tags, imports, includes."""
-        jsp_tags = []
-        java_imports = []
-        jsp_includes = []
-        dependencies = []
-        
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            # JSP page directive imports
-            page_import = re.search(r'<%@\s*page\s+.*?import\s*=\s*["\']([^"\']+)["\']', line)
-            if page_import:
-                imp_name = page_import.group(1)
-                java_imports.append(imp_name)
-                dependencies.append({
-                    'type': 'jsp_import',
-                    'name': imp_name,
-                    'line': i + 1
-                })
-            
-            # JSP includes
-            include_match = re.search(r'<%@\s*include\s+file\s*=\s*["\']([^"\']+)["\']', line)
-            if include_match:
-                inc_file = include_match.group(1)
-                jsp_includes.append(inc_file)
-                dependencies.append({
-                    'type': 'jsp_include',
-                    'name': inc_file,
-                    'line': i + 1
-                })
-            
-            # JSP forward
-            forward_match = re.search(r'<jsp:forward\s+page\s*=\s*["\']([^"\']+)["\']', line)
-            if forward_match:
-                forward_page = forward_match.group(1)
-                jsp_includes.append(forward_page)
-                dependencies.append({
-                    'type': 'jsp_forward',
-                    'name': forward_page,
-                    'line': i + 1
-                })
-            
-            # Custom JSP tags
-            custom_tags = re.findall(r'<(\w+):(\w+)', line)
-            for namespace, tag in custom_tags:
-                jsp_tags.append(f"{namespace}:{tag}")
+        visitor = _PythonSymbolVisitor()
+        visitor.visit(tree)
         
         return {
-            'jsp_tags': jsp_tags,
-            'java_imports': java_imports,
-            'jsp_includes': jsp_includes,
-            'imports': java_imports + jsp_includes,
-            'dependencies': dependencies
+            'functions': visitor.functions,
+            'classes': visitor.classes,
+            'imports': visitor.imports,
+            'dependencies': visitor.dependencies
         }
     
-    def _parse_html(self, content: str, file_path: str) -> Dict:
-        """Parse HTML for structure information."""
-        tag_pattern = r'<(\w+)(?:\s+[^>]*)?>'
-        link_pattern = r'(?:src|href)\s*=\s*["\']([^"\']+)["\']'
+    def _parse_javascript(self, content: Union[str, bytes], file_path: str) -> Dict:
+        """Parse JavaScript/TypeScript for functions, classes, imports, exports.
+
+        Single pass over the file; comments and string literals are skipped and
+        multi-line import/export statements are handled. Uses the tree-sitter
+        backend instead when it is enabled and installed.
+        """
+        if self.tree_sitter:
+            parsed = self.tree_sitter.parse(self.classify_language(file_path), content, file_path)
+            if parsed is not None:
+                return parsed
+        return scan_javascript(content)
+    
+    def _parse_java(self, content: str, file_path: str) -> Dict:
+        """Parse Java for package, classes, methods, imports.
+
+        Token-based scanner with a fixed worst-case cost per byte; handles
+        annotations and declarations spanning several lines. Uses the
+        tree-sitter backend instead when it is enabled and installed.
+        """
+        if self.tree_sitter:
+            parsed = self.tree_sitter.parse('java', content, file_path)
+            if parsed is not None:
+                return parsed
+        return scan_java(content)
+    
+    def _parse_jsp(self, content: Union[str, bytes], file_path: str) -> Dict:
+        """Parse JSP files for tags, imports, includes in a single pass."""
+        return scan_jsp(content)
+    
+    def _parse_html(self, content: Union[str, bytes], file_path: str) -> Dict:
+        """Parse HTML for tag counts and src/href links, in a single pass."""
+        return scan_html(content)
+    
+    def _parse_html_file(self, file_path: str) -> Dict:
+        """Parse a large HTML file in bounded chunks; includes size and lines."""
+        return scan_html_file(file_path)
+    
+    def _parse_css(self, content: Union[str, bytes], file_path: str) -> Dict:
+        """Parse CSS for selectors and rules."""
+        return scan_css(content)
+    
+    def _parse_sql(self, content: Union[str, bytes], file_path: str) -> Dict:
+        """Parse SQL files for tables, procedures, functions."""
+        return scan_sql(content)
+    
+    def _parse_sql_file(self, file_path: str) -> Dict:
+        """Parse a large SQL file through a memory map; includes size and lines."""
+        return scan_sql_file(file_path)
+    
+    def parse_codebase(self, repo_path: str, jobs: int = None, subdir: str = '', recursive: bool = True,
+                       sample_files: int = None, sample_seconds: float = None, seed: int = 0) -> Dict:
+        """Parse entire codebase and extract metadata.
+
+        With ``jobs`` > 1 (or 0 for one per CPU) files are parsed in a process
+        pool, largest first; the result is identical to the serial run.
+        ``subdir`` restricts the run to one subtree (see core.shards); paths
+        stay relative to repo_path. With ``recursive=False`` only the files
+        directly in subdir (or the repository root) are parsed.
+
+        Setting ``sample_files`` and/or ``sample_seconds`` switches to sampling
+        mode for very large repositories (see _sample_codebase): only a
+        stratified sample is parsed and the counts are estimates.
+        """
+        jobs = self._resolve_jobs(jobs)
+        if sample_files is not None or sample_seconds is not None:
+            return self._sample_codebase(repo_path, jobs, subdir, sample_files, sample_seconds, seed, recursive)
+        aggregator = MetadataAggregator(compact=self.compact)
         
-        tags = re.findall(tag_pattern, content.lower())
-        links = re.findall(link_pattern, content)
+        if jobs > 1:
+            file_paths = list(self._iter_source_paths(repo_path, subdir, recursive))
+            for file_path, file_metadata in zip(file_paths, self._extract_parallel(file_paths, jobs)):
+                if file_metadata:
+                    # Make path relative to repo root
+                    file_metadata['path'] = os.path.relpath(file_path, repo_path)
+                    aggregator.add(file_metadata)
+            if self.cache:
+                self.cache.prune()
+        else:
+            for file_metadata in self.iter_file_metadata(repo_path, jobs=1, subdir=subdir, recursive=recursive):
+                aggregator.add(file_metadata)
         
-        tag_counts = {}
-        dependencies = []
+        return aggregator.get_metadata()
+    
+    def iter_file_metadata(self, repo_path: str, jobs: int = None, max_in_flight: int = None, subdir: str = '',
+                           recursive: bool = True):
+        """Yield per-file metadata (with repo-relative paths) as files are parsed.
+
+        The tree is walked lazily and, with ``jobs`` > 1, at most
+        ``max_in_flight`` files (default 4 per worker) are queued at once, so
+        memory depends on the files in flight rather than the repository size.
+        In parallel mode files are yielded in completion order.
+        """
+        jobs = self._resolve_jobs(jobs)
+        file_paths = self._iter_source_paths(repo_path, subdir, recursive)
         
-        for tag in tags:
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        if jobs > 1:
+            results = self._iter_parallel(file_paths, jobs, max_in_flight or jobs * 4)
+        elif self.prefetch:
+            reader = ReadAheadReader(self._prefetch_file, workers=self.prefetch)
+            results = ((path, self.extract_file_metadata(path, data)) for path, data in reader.iter(file_paths))
+        else:
+            results = ((path, self.extract_file_metadata(path)) for path in file_paths)
         
-        for i, link in enumerate(links):
-            if not link.startswith(('http://', 'https://', 'mailto:', '#')):
-                dependencies.append({
-                    'type': 'resource_link',
-                    'name': link,
-                    'line': i + 1
-                })
-            
-        return {
-            'tags': tag_counts, 
-            'total_tags': len(tags),
-            'resource_links': links,
-            'dependencies': dependencies
-        }
+        for file_path, file_metadata in results:
+            if file_metadata:
+                file_metadata['path'] = os.path.relpath(file_path, repo_path)
+                yield file_metadata
+        
+        if self.cache:
+            self.cache.prune()
     
-    def _parse_css(self, content: str, file_path: str) -> Dict:
-        """Parse CSS for selectors and rules."""
-        selector_pattern = r'([^{}\n]+)\s*{'
-        import_pattern = r'@import\s+["\']([^"\']+)["\']'
+    def _sample_codebase(self, repo_path: str, jobs: int, subdir: str, sample_files: Optional[int],
+                         sample_seconds: Optional[float], seed: int, recursive: bool = True) -> Dict:
+        """Parse a stratified sample of the codebase and extrapolate the totals.
+
+        Every candidate file is counted and its newlines tallied without
+        parsing. Files are stratified by language and top-level directory,
+        the budget of ``sample_files`` is split across strata with
+        allocate_sample, and each stratum's files are drawn with a seeded RNG.
+        Files are parsed round-robin by rank within their stratum, so
+        stopping at ``sample_seconds`` still leaves every stratum represented
+        as evenly as time allowed; at least one file is always parsed.
+
+        ``files`` and project_structure hold the sampled files only.
+        language_stats, total_files and total_lines are scaled up per stratum
+        by the sample's parse success and parsed-to-counted line ratios, and
+        marked ``estimated``; metadata['sampling'] describes the run and holds
+        the estimated project_structure counts.
+        """
+        start = time.perf_counter()
+        base = os.path.join(repo_path, subdir) if subdir else repo_path
+        strata = defaultdict(list)
+        for file_path in self._iter_source_paths(repo_path, subdir, recursive):
+            language = self.classify_language(file_path)
+            if language == 'unknown':
+                continue
+            parts = os.path.relpath(file_path, base).split(os.sep)
+            directory = parts[0] if len(parts) > 1 else '.'
+            count_start = time.perf_counter()
+            strata[(language, directory)].append((file_path, self._count_file_lines(file_path)))
+            self.profiler.add_phase('count', time.perf_counter() - count_start)
         
-        selectors = re.findall(selector_pattern, content)
-        css_imports = re.findall(import_pattern, content)
+        counts = {key: len(entries) for key, entries in strata.items()}
+        candidates = sum(counts.values())
+        budget = candidates if sample_files is None else max(sample_files, 1)
+        # Serve every language before a second directory of any of them
+        largest = {}
+        for key in sorted(counts, key=lambda key: -counts[key]):
+            largest.setdefault(key[0], key)
+        allocation = allocate_sample(counts, budget, first=set(largest.values()))
         
-        selectors = [s.strip() for s in selectors if s.strip()]
-        dependencies = []
+        rng = random.Random(seed)
+        ranked = []
+        chosen = {}
+        for key in sorted(strata):
+            picks = rng.sample(strata[key], allocation[key])
+            for rank, (file_path, raw_lines) in enumerate(picks):
+                ranked.append(((rank + 0.5) / len(picks), key, file_path))
+                chosen[file_path] = (key, raw_lines)
+        ranked.sort()
+        order = [file_path for _, _, file_path in ranked]
         
-        for imp in css_imports:
-            dependencies.append({
-                'type': 'css_import',
-                'name': imp,
-                'line': 1  # Would need line-by-line parsing for exact line numbers
-            })
+        deadline = start + sample_seconds if sample_seconds is not None else None
+        if jobs > 1:
+            results = self._iter_parallel(iter(order), jobs, jobs * 4)
+        else:
+            results = ((file_path, self.extract_file_metadata(file_path)) for file_path in order)
         
-        return {
-            'selectors': selectors, 
-            'total_rules': len(selectors),
-            'css_imports': css_imports,
-            'dependencies': dependencies
+        parsed = {}
+        sampled = defaultdict(lambda: [0, 0, 0, 0])  # attempted, parsed, counted lines, parsed lines
+        stopped = 'files' if budget < candidates else 'complete'
+        for file_path, file_metadata in results:
+            key, raw_lines = chosen[file_path]
+            stats = sampled[key]
+            stats[0] += 1
+            stats[2] += raw_lines
+            if file_metadata:
+                stats[1] += 1
+                stats[3] += file_metadata['lines']
+                parsed[file_path] = file_metadata
+            if deadline is not None and time.perf_counter() >= deadline:
+                if sum(s[0] for s in sampled.values()) < len(order):
+                    stopped = 'time'
+                break
+        results.close()
+        
+        aggregator = MetadataAggregator(compact=self.compact)
+        for file_path in order:
+            if file_path in parsed:
+                file_metadata = parsed[file_path]
+                file_metadata['path'] = os.path.relpath(file_path, repo_path)
+                aggregator.add(file_metadata)
+        if self.cache:
+            self.cache.prune()
+        
+        # Ratios per stratum, falling back to the language's, then the whole sample's
+        def pooled(keys) -> Optional[Tuple[float, float]]:
+            totals = [sum(sampled[key][i] for key in keys if key in sampled) for i in range(4)]
+            if not totals[0]:
+                return None
+            return totals[1] / totals[0], (totals[3] / totals[2] if totals[2] else 1.0)
+        
+        overall = pooled(list(sampled)) or (1.0, 1.0)
+        by_language = {}
+        for language in {key[0] for key in strata}:
+            by_language[language] = pooled([key for key in sampled if key[0] == language]) or overall
+        
+        language_stats = {}
+        structure_counts = {category: 0.0 for category in STRUCTURE_CATEGORIES}
+        for key, entries in strata.items():
+            language = key[0]
+            file_ratio, line_ratio = pooled([key]) or by_language[language]
+            stats = language_stats.setdefault(language, {'files': 0.0, 'lines': 0.0, 'sampled_files': 0})
+            stats['files'] += len(entries) * file_ratio
+            stats['lines'] += sum(raw_lines for _, raw_lines in entries) * line_ratio
+            stats['sampled_files'] += sampled[key][1] if key in sampled else 0
+            for file_path, _ in entries:
+                category = structure_category({'path': os.path.relpath(file_path, repo_path), 'language': language})
+                if category:
+                    structure_counts[category] += file_ratio
+        
+        metadata = aggregator.get_metadata()
+        metadata['language_stats'] = {
+            language: {'files': round(stats['files']), 'lines': round(stats['lines']),
+                       'sampled_files': stats['sampled_files'], 'estimated': True}
+            for language, stats in language_stats.items() if round(stats['files'])
         }
+        metadata['total_files'] = sum(stats['files'] for stats in metadata['language_stats'].values())
+        metadata['total_lines'] = sum(stats['lines'] for stats in metadata['language_stats'].values())
+        metadata['sampling'] = {
+            'estimated': True,
+            'seed': seed,
+            'budget': {'files': sample_files, 'seconds': sample_seconds},
+            'candidate_files': candidates,
+            'counted_lines': sum(raw_lines for entries in strata.values() for _, raw_lines in entries),
+            'strata': len(strata),
+            'sampled_files': len(parsed),
+            'attempted_files': sum(s[0] for s in sampled.values()),
+            'stopped': stopped,
+            'seconds': round(time.perf_counter() - start, 3),
+            'project_structure': {category: round(count) for category, count in structure_counts.items()},
+        }
+        return metadata
     
-    def _parse_sql(self, content: str, file_path: str) -> Dict:
-        """Parse SQL files for tables, procedures, functions."""
-        tables = []
-        procedures = []
-        functions = []
-        dependencies = []
-        
-        # SQL patterns
-        create_table_pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)'
-        create_proc_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?PROCEDURE\s+(\w+)'
-        create_func_pattern = r'CREATE\s+(?:OR\s+REPLACE\s+)?FUNCTION\s+(\w+)'
-        reference_pattern = r'REFERENCES\s+(\w+)'
-        
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            # Tables
-            table_matches = re.finditer(create_table_pattern, line, re.IGNORECASE)
-            for match in table_matches:
-                tables.append({'name': match.group(1), 'line': i + 1})
-            
-            # Procedures
-            proc_matches = re.finditer(create_proc_pattern, line, re.IGNORECASE)
-            for match in proc_matches:
-                procedures.append({'name': match.group(1), 'line': i + 1})
-            
-            # Functions
-            func_matches = re.finditer(create_func_pattern, line, re.IGNORECASE)
-            for match in func_matches:
-                functions.append({'name': match.group(1), 'line': i + 1})
-            
-            # Foreign key references
-            ref_matches = re.finditer(reference_pattern, line, re.IGNORECASE)
-            for match in ref_matches:
-                dependencies.append({
-                    'type': 'table_reference',
-                    'name': match.group(1),
-                    'line': i + 1
-                })
+    def reset_run_statistics(self) -> None:
+        """Reset the cache, pre-filter and profiler counters."""
+        self.profiler.reset()
+        if self.cache:
+            self.cache.hits = self.cache.misses = 0
+        if self.prefilter:
+            self.prefilter.reset()
+    
+    def get_run_statistics(self) -> Dict:
+        """Get cache hit/miss, pre-filter rejection and timing counters."""
+        stats = {'profile': self.profiler.to_dict()}
+        if self.cache:
+            stats['cache'] = self.cache.get_statistics()
+        if self.prefilter:
+            stats['prefilter'] = self.prefilter.get_statistics()
+        return stats
+    
+    def merge_run_statistics(self, stats: Dict) -> None:
+        """Add counters returned by a pool worker."""
+        if 'profile' in stats:
+            self.profiler.merge(stats['profile'])
+        if self.cache and 'cache' in stats:
+            self.cache.hits += stats['cache']['hits']
+            self.cache.misses += stats['cache']['misses']
+        if self.prefilter and 'prefilter' in stats:
+            self.prefilter.merge(stats['prefilter'])
+    
+    def _resolve_jobs(self, jobs: Optional[int]) -> int:
+        jobs = self.jobs if jobs is None else jobs
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        return jobs
+    
+    def update_codebase(self, repo_path: str, previous_metadata: Dict,
+                        base_commit: str, head_commit: str = 'HEAD') -> Dict:
+        """Incrementally update metadata from a previous run.
+
+        Only files reported by ``git diff --name-status`` between base_commit
+        and head_commit are reparsed. previous_metadata is patched in place and
+        returned; the result matches a full parse_codebase run at head_commit.
+        When a ``.gitignore`` changed the whole tree is parsed again, since
+        any unchanged file may have become ignored or un-ignored. The
+        untracked ``.git/info/exclude`` is not in the diff: files it newly
+        ignores are dropped, but files it un-ignores need a full run.
+        """
+        if 'sampling' in previous_metadata:
+            raise Exception("Sampled metadata cannot be updated incrementally; run a full parse first")
+        changes = self._git_changed_files(repo_path, base_commit, head_commit)
+        if any(os.path.basename(path) == '.gitignore' for _, old_path, new_path in changes
+               for path in (old_path, new_path)):
+            metadata = self.parse_codebase(repo_path)
+            previous_metadata.clear()
+            previous_metadata.update(metadata)
+            return previous_metadata
         
-        return {
-            'tables': tables,
-            'procedures': procedures,
-            'functions': functions,
-            'dependencies': dependencies
-        }
+        aggregator = MetadataAggregator(metadata=previous_metadata)
+        matcher = self.compile_path_matcher(repo_path)
+        files_by_path = {f['path']: f for f in previous_metadata['files']}
+        
+        removed = set()
+        reparse = set()
+        for status, old_path, new_path in changes:
+            if status in ('D', 'R'):
+                removed.add(old_path)
+            if status != 'D':
+                reparse.add(new_path)
+                removed.discard(new_path)
+        
+        for path in removed | reparse:
+            files_by_path.pop(path, None)
+        
+        for path in reparse:
+            file_path = os.path.join(repo_path, path)
+            if matcher.is_ignored(path) or not os.path.isfile(file_path):
+                continue
+            file_metadata = self.extract_file_metadata(file_path)
+            if file_metadata:
+                file_metadata['path'] = path
+                if self.compact:
+                    file_metadata = FileMetadata.from_dict(file_metadata)
+                files_by_path[path] = file_metadata
+        
+        # Restore walk order so the file list is identical to a full run; this
+        # also drops unchanged files that are now ignored
+        previous_metadata['files'] = [
+            files_by_path[rel_path]
+            for rel_path in (os.path.relpath(p, repo_path) for p in self._iter_source_paths(repo_path))
+            if rel_path in files_by_path
+        ]
+        previous_metadata['total_files'] = len(previous_metadata['files'])
+        previous_metadata['language_stats'] = {}
+        previous_metadata['total_lines'] = 0
+        for file_metadata in previous_metadata['files']:
+            aggregator.add_stats(file_metadata)
+        previous_metadata['project_structure'] = self._analyze_project_structure(previous_metadata['files'])
+        
+        return previous_metadata
     
-    def parse_codebase(self, repo_path: str) -> Dict:
-        """Parse entire codebase and extract metadata."""
-        metadata = {
-            'files': [],
-            'language_stats': {},
-            'total_files': 0,
-            'total_lines': 0,
-            'project_structure': {}
-        }
+    def _git_changed_files(self, repo_path: str, base_commit: str, head_commit: str) -> List[Tuple[str, str, str]]:
+        """List (status, old_path, new_path) for files changed between two commits.
+
+        Paths are relative to repo_path; status is one of A, M, D, R, C, T.
+        """
+        try:
+            result = subprocess.run(
+                ['git', '-C', repo_path, 'diff', '--name-status', '-z', '-M', '--relative',
+                 base_commit, head_commit],
+                check=True, capture_output=True, text=True
+            )
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to diff {base_commit}..{head_commit}: {e.stderr.strip()}")
         
-        for root, dirs, files in os.walk(repo_path):
-            # Filter out ignored directories
-            dirs[:] = [d for d in dirs if not self.should_ignore_path(os.path.join(root, d))]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                
-                if self.should_ignore_path(file_path):
-                    continue
-                    
-                file_metadata = self.extract_file_metadata(file_path)
-                if file_metadata:
-                    # Make path relative to repo root
-                    rel_path = os.path.relpath(file_path, repo_path)
-                    file_metadata['path'] = rel_path
-                    
-                    metadata['files'].append(file_metadata)
-                    
-                    lang = file_metadata['language']
-                    if lang not in metadata['language_stats']:
-                        metadata['language_stats'][lang] = {'files': 0, 'lines': 0}
-                    
-                    metadata['language_stats'][lang]['files'] += 1
-                    metadata['language_stats'][lang]['lines'] += file_metadata['lines']
-                    metadata['total_lines'] += file_metadata['lines']
-        
-        metadata['total_files'] = len(metadata['files'])
-        metadata['project_structure'] = self._analyze_project_structure(metadata['files'])
+        fields = result.stdout.split('\0')
+        changes = []
+        i = 0
+        while i < len(fields) and fields[i]:
+            status = fields[i][0]
+            if status in ('R', 'C'):
+                old_path, new_path = fields[i + 1], fields[i + 2]
+                i += 3
+            else:
+                old_path = new_path = fields[i + 1]
+                i += 2
+            changes.append((status, os.path.normpath(old_path), os.path.normpath(new_path)))
+        return changes
+    
+    def _iter_source_paths(self, repo_path: str, subdir: str = '', recursive: bool = True):
+        """Yield candidate file paths under repo_path in walk order, pruning ignored directories.
+
+        Time spent walking (excluding the consumer) is added to the profiler's walk phase.
+        """
+        self.profiler.root = repo_path
+        start = time.perf_counter()
+        for root, files in self.compile_path_matcher(repo_path).walk(subdir, recursive):
+            paths = [os.path.join(root, file) for file in files]
+            self.profiler.add_phase('walk', time.perf_counter() - start)
+            yield from paths
+            start = time.perf_counter()
+    
+    def _extract_parallel(self, file_paths: List[str], jobs: int) -> List[Dict]:
+        """Extract metadata for file_paths in a process pool, largest files first."""
+        def file_size(index: int) -> int:
+            try:
+                return os.path.getsize(file_paths[index])
+            except OSError:
+                return 0
         
-        return metadata
+        order = sorted(range(len(file_paths)), key=file_size, reverse=True)
+        results = [None] * len(file_paths)
+        
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_parse_worker,
+                                 initargs=(self,)) as executor:
+            futures = [executor.submit(_parse_file_in_worker, i, file_paths[i]) for i in order]
+            for future in as_completed(futures):
+                index, file_metadata, stats = future.result()
+                results[index] = file_metadata
+                self.merge_run_statistics(stats)
+        
+        return results
+    
+    def _iter_parallel(self, file_paths, jobs: int, max_in_flight: int):
+        """Yield (path, metadata) from a process pool with a bounded submission window."""
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_parse_worker,
+                                 initargs=(self,)) as executor:
+            in_flight = {}
+            
+            def drain():
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    _, file_metadata, stats = future.result()
+                    self.merge_run_statistics(stats)
+                    yield file_path, file_metadata
+            
+            for file_path in file_paths:
+                in_flight[executor.submit(_parse_file_in_worker, 0, file_path)] = file_path
+                if len(in_flight) >= max_in_flight:
+                    yield from drain()
+            
+            while in_flight:
+                yield from drain()
     
     def _analyze_project_structure(self, files: List[Dict]) -> Dict:
         """Analyze project structure and identify patterns."""
-        structure = {
-            'web_files': [],
-            'backend_files': [],
-            'database_files': [],
-            'config_files': [],
-            'test_files': [],
-            'documentation_files': []
-        }
+        structure = {category: [] for category in STRUCTURE_CATEGORIES}
         
         for file_data in files:
-            path = file_data['path'].lower()
-            lang = file_data['language']
-            
-            if lang in ['html', 'css', 'javascript', 'jsp']:
-                structure['web_files'].append(file_data)
-            elif lang in ['java', 'python']:
-                if 'test' in path or 'spec' in path:
-                    structure['test_files'].append(file_data)
-                else:
-                    structure['backend_files'].append(file_data)
-            elif lang == 'sql':
-                structure['database_files'].append(file_data)
-            elif lang in ['json', 'yaml', 'properties', 'xml'] or 'config' in path:
-                structure['config_files'].append(file_data)
-            elif lang == 'markdown' or path.endswith('.md'):
-                structure['documentation_files'].append(file_data)
+            category = structure_category(file_data)
+            if category:
+                structure[category].append(file_data)
         
         return structure
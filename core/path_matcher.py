@@ -0,0 +1,214 @@
+# core/path_matcher.py
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def translate_gitignore_pattern(pattern: str) -> Tuple[Optional[str], bool, bool, bool]:
+    """Translate one gitignore line into (regex, anchored, negated, dir_only).
+
+    Anchored regexes match a '/'-separated path relative to the directory that
+    owns the pattern; unanchored ones (no inner slash) match a single name.
+    Blank lines and comments return a None regex.
+    """
+    line = pattern.rstrip('\r\n')
+    if not line.strip() or line.startswith('#'):
+        return None, False, False, False
+    if not line.endswith('\\ '):
+        line = line.rstrip()
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None, False, False, False
+
+    anchored = '/' in line
+    line = line.lstrip('/')
+
+    regex = []
+    i = 0
+    n = len(line)
+    while i < n:
+        c = line[i]
+        at_segment_start = i == 0 or line[i - 1] == '/'
+        if at_segment_start and line.startswith('**/', i):
+            regex.append('(?:.*/)?')
+            i += 3
+        elif at_segment_start and line.startswith('**', i) and i + 2 == n:
+            regex.append('.*')
+            i += 2
+        elif c == '*':
+            regex.append('[^/]*')
+            i += 1
+        elif c == '?':
+            regex.append('[^/]')
+            i += 1
+        elif c == '[':
+            first = i + 2 if line[i + 1:i + 2] in ('!', '^') else i + 1
+            end = line.find(']', first + 1)
+            if end == -1:
+                regex.append(re.escape(c))
+                i += 1
+            else:
+                body = line[i + 1:end]
+                if body[0] in ('!', '^'):
+                    body = '^' + body[1:]
+                regex.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end + 1
+        elif c == '\\' and i + 1 < n:
+            regex.append(re.escape(line[i + 1]))
+            i += 2
+        else:
+            regex.append(re.escape(c))
+            i += 1
+
+    return ''.join(regex), anchored, negated, dir_only
+
+
+class _PatternSet:
+    """Compiled patterns from one source (ignore_patterns or a single .gitignore).
+
+    Name patterns and anchored path patterns are each joined into one
+    alternation in reverse order, so a single fullmatch finds the last
+    matching pattern, which is the one git honours.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        rules = {(False, False): [], (False, True): [], (True, False): [], (True, True): []}
+        for index, pattern in enumerate(patterns):
+            regex, anchored, negated, dir_only = translate_gitignore_pattern(pattern)
+            if regex is None:
+                continue
+            rules[(anchored, True)].append((index, regex, negated))
+            if not dir_only:
+                rules[(anchored, False)].append((index, regex, negated))
+        self._compiled = {key: self._compile(value) for key, value in rules.items()}
+        self.empty = not any(rules.values())
+
+    @staticmethod
+    def _compile(rules: List[Tuple[int, str, bool]]):
+        if not rules:
+            return None, []
+        rules = rules[::-1]
+        regex = re.compile('|'.join(f'({body})' for _, body, _ in rules), re.DOTALL)
+        # Outer group number -> (pattern index, negated); inner groups are non-capturing
+        return regex, [(index, negated) for index, _, negated in rules]
+
+    def _search(self, anchored: bool, is_dir: bool, text: str) -> Optional[Tuple[int, bool]]:
+        regex, groups = self._compiled[(anchored, is_dir)]
+        if regex is None:
+            return None
+        match = regex.fullmatch(text)
+        return groups[match.lastindex - 1] if match else None
+
+    def match(self, rel_path: str, name: str, is_dir: bool) -> Optional[bool]:
+        """Return True (ignored), False (re-included) or None (no pattern matched)."""
+        by_name = self._search(False, is_dir, name)
+        by_path = self._search(True, is_dir, rel_path)
+        if by_name is None and by_path is None:
+            return None
+        _, negated = max(r for r in (by_name, by_path) if r is not None)
+        return not negated
+
+
+class PathMatcher:
+    """Compiled, gitignore-aware ignore matcher for one repository root.
+
+    ``patterns`` (CodebaseParser.ignore_patterns) act as the lowest-priority
+    source, followed by ``.git/info/exclude`` and then each ``.gitignore``
+    from the root down, with deeper files overriding shallower ones as in git.
+    ``.gitignore`` files are compiled once, the first time their directory is
+    seen. With ``ignore_hidden`` every dot-prefixed entry is skipped.
+    """
+
+    def __init__(self, root: Optional[str], patterns: Iterable[str],
+                 use_gitignore: bool = True, ignore_hidden: bool = True):
+        self.root = root
+        self.use_gitignore = use_gitignore and root is not None
+        self.ignore_hidden = ignore_hidden
+        self._base = _PatternSet(patterns)
+        self._gitignores: Dict[str, Optional[_PatternSet]] = {}
+        self._scope_cache: Dict[str, List[Tuple[int, _PatternSet]]] = {}
+        if self.use_gitignore:
+            self._base_exclude = self._load(os.path.join(root, '.git', 'info', 'exclude'))
+        else:
+            self._base_exclude = None
+
+    def _load(self, path: str) -> Optional[_PatternSet]:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                return _PatternSet(f.read().splitlines())
+        except OSError:
+            return None
+
+    def _gitignore_for(self, rel_dir: str) -> Optional[_PatternSet]:
+        if rel_dir not in self._gitignores:
+            pattern_set = self._load(os.path.join(self.root, rel_dir, '.gitignore'))
+            self._gitignores[rel_dir] = pattern_set if pattern_set and not pattern_set.empty else None
+        return self._gitignores[rel_dir]
+
+    def _scopes(self, rel_dir: str) -> List[Tuple[int, _PatternSet]]:
+        """Active .gitignore sets for entries in rel_dir as (prefix length, set), deepest first."""
+        scopes = self._scope_cache.get(rel_dir)
+        if scopes is None:
+            scopes = []
+            if self.use_gitignore:
+                own = self._gitignore_for(rel_dir)
+                if own:
+                    scopes.append((len(rel_dir) + 1 if rel_dir else 0, own))
+                if rel_dir:
+                    scopes.extend(self._scopes(rel_dir.rsplit('/', 1)[0] if '/' in rel_dir else ''))
+                elif self._base_exclude:
+                    scopes.append((0, self._base_exclude))
+            self._scope_cache[rel_dir] = scopes
+        return scopes
+
+    def _match_entry(self, rel_path: str, name: str, is_dir: bool,
+                     scopes: List[Tuple[int, _PatternSet]]) -> bool:
+        """Decide a single entry, assuming its parent directories are not ignored."""
+        if self.ignore_hidden and name.startswith('.'):
+            return True
+        for offset, pattern_set in scopes:
+            result = pattern_set.match(rel_path[offset:], name, is_dir)
+            if result is not None:
+                return result
+        return bool(self._base.match(rel_path, name, is_dir))
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path relative to root, including all of its parent directories."""
+        rel_path = rel_path.replace(os.sep, '/').strip('/')
+        if not rel_path or rel_path == '.':
+            return False
+        parts = rel_path.split('/')
+        for i in range(len(parts)):
+            rel_dir = '/'.join(parts[:i])
+            if self._match_entry('/'.join(parts[:i + 1]), parts[i], i < len(parts) - 1 or is_dir,
+                                 self._scopes(rel_dir)):
+                return True
+        return False
+
+    def walk(self, subdir: str = '', recursive: bool = True):
+        """os.walk over root that prunes ignored directories and drops ignored files.
+
+        Yields (dirpath, filenames) for every directory that is not ignored.
+        With ``subdir`` (relative to root) only that subtree is walked, still
+        honouring .gitignore files above it; nothing is yielded if it is ignored.
+        With ``recursive=False`` only the files directly in it are yielded.
+        """
+        subdir = subdir.replace(os.sep, '/').strip('/')
+        if subdir and self.is_ignored(subdir, is_dir=True):
+            return
+        for dirpath, dirs, files in os.walk(os.path.join(self.root, subdir) if subdir else self.root):
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            if rel_dir == '.':
+                rel_dir = ''
+            prefix = rel_dir + '/' if rel_dir else ''
+            scopes = self._scopes(rel_dir)
+            dirs[:] = [d for d in dirs if recursive and not self._match_entry(prefix + d, d, True, scopes)]
+            yield dirpath, [f for f in files if not self._match_entry(prefix + f, f, False, scopes)]
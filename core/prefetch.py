@@ -0,0 +1,34 @@
+# core/prefetch.py
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+
+class ReadAheadReader:
+    """Read files ahead of the consumer on a small thread pool.
+
+    ``read`` is called in worker threads and must only do I/O on immutable
+    state; it returns the file's bytes or None to let the consumer handle
+    the file itself. At most ``depth`` reads are queued or held at once, and
+    results are yielded in input order, so parsing overlaps with the next
+    reads without changing the output. Useful when open()/read() latency
+    (NFS, network mounts) rather than CPU dominates.
+    """
+
+    def __init__(self, read: Callable[[str], Optional[bytes]], workers: int = 4, depth: int = 64):
+        self.read = read
+        self.workers = workers
+        self.depth = max(depth, workers)
+
+    def iter(self, file_paths: Iterable[str]) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """Yield (path, bytes or None) for file_paths, in order."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='read-ahead') as executor:
+            pending = deque()
+            for file_path in file_paths:
+                pending.append((file_path, executor.submit(self.read, file_path)))
+                if len(pending) >= self.depth:
+                    path, future = pending.popleft()
+                    yield path, future.result()
+            while pending:
+                path, future = pending.popleft()
+                yield path, future.result()
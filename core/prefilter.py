@@ -0,0 +1,120 @@
+# core/prefilter.py
+import os
+from typing import Dict, Iterable, Optional
+
+# Bytes that appear in text files; anything else in the sniffed prefix counts
+# towards the binary ratio (same idea as file(1) and git's binary detection).
+_TEXT_BYTES = bytes({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+
+DEFAULT_GENERATED_SUFFIXES = (
+    '.min.js', '.min.css', '-min.js', '.bundle.js', '.chunk.js', '.pb.go', '_pb2.py'
+)
+
+# Languages where a very long first line means minified output
+MINIFIABLE_EXTENSIONS = frozenset(['.js', '.jsx', '.ts', '.tsx', '.css', '.scss', '.html', '.htm'])
+
+
+class FilePrefilter:
+    """Cheap checks that reject files before CodebaseParser reads them.
+
+    Checks run cheapest first: extension, generated-file name, size cap,
+    then a sniff of the first ``sniff_bytes`` for binary content and
+    minified (very long) lines. Extensions in ``size_exempt_extensions``
+    (those with a streaming parser) bypass the size cap. Rejections are
+    counted by reason together with the bytes that were never read.
+    """
+
+    REASONS = ('extension', 'generated', 'size', 'binary', 'minified')
+
+    def __init__(self, supported_extensions: Iterable[str], max_file_size: Optional[int] = 10 * 1024 * 1024,
+                 sniff_bytes: int = 8192, max_line_length: int = 2000,
+                 generated_suffixes: Iterable[str] = DEFAULT_GENERATED_SUFFIXES,
+                 size_exempt_extensions: Iterable[str] = ()):
+        self.supported_extensions = frozenset(ext.lower() for ext in supported_extensions)
+        self.max_file_size = max_file_size
+        self.size_exempt_extensions = frozenset(ext.lower() for ext in size_exempt_extensions)
+        self.sniff_bytes = sniff_bytes
+        self.max_line_length = max_line_length
+        self.generated_suffixes = tuple(s.lower() for s in generated_suffixes)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the rejection counters."""
+        self.rejections = {reason: {'files': 0, 'bytes': 0} for reason in self.REASONS}
+
+    def check(self, file_path: str, size: Optional[int] = None, head: Optional[bytes] = None) -> Optional[str]:
+        """Return the rejection reason for file_path, or None if it should be parsed.
+
+        ``size`` and ``head`` (the file's leading bytes) skip the stat and the
+        sniff read when the caller already has them, e.g. from read-ahead.
+        """
+        reason = self.name_rejection(file_path)
+        if reason:
+            return self._reject(reason, file_path)
+
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                return None
+        if self.exceeds_size(file_path, size):
+            return self._reject('size', file_path, size)
+
+        if head is None:
+            try:
+                with open(file_path, 'rb') as f:
+                    head = f.read(self.sniff_bytes)
+            except OSError:
+                return None
+
+        reason = self.head_rejection(file_path, head)
+        if reason:
+            return self._reject(reason, file_path, size)
+        return None
+
+    def name_rejection(self, file_path: str) -> Optional[str]:
+        """The reason file_path is rejected by extension or generated-file name, without counting it.
+
+        Needs no I/O, so read-ahead threads can skip such files before reading them.
+        """
+        name = os.path.basename(file_path).lower()
+        if os.path.splitext(name)[1] not in self.supported_extensions:
+            return 'extension'
+        if name.endswith(self.generated_suffixes):
+            return 'generated'
+        return None
+
+    def head_rejection(self, file_path: str, head: bytes) -> Optional[str]:
+        """The reason the sniffed leading bytes reject file_path (binary, minified), without counting it."""
+        head = head[:self.sniff_bytes]
+        if b'\0' in head or len(head.translate(None, _TEXT_BYTES)) * 10 > len(head) * 3:
+            return 'binary'
+        if os.path.splitext(file_path)[1].lower() in MINIFIABLE_EXTENSIONS and len(head) > self.max_line_length:
+            if max(map(len, head.split(b'\n'))) > self.max_line_length:
+                return 'minified'
+        return None
+
+    def exceeds_size(self, file_path: str, size: int) -> bool:
+        """True if a file of this size would be rejected by the size cap."""
+        return (self.max_file_size is not None and size > self.max_file_size
+                and os.path.splitext(file_path)[1].lower() not in self.size_exempt_extensions)
+
+    def _reject(self, reason: str, file_path: str, size: int = None) -> str:
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+        self.rejections[reason]['files'] += 1
+        self.rejections[reason]['bytes'] += size
+        return reason
+
+    def merge(self, rejections: Dict) -> None:
+        """Add counters collected elsewhere (e.g. in a pool worker)."""
+        for reason, counts in rejections.items():
+            self.rejections[reason]['files'] += counts['files']
+            self.rejections[reason]['bytes'] += counts['bytes']
+
+    def get_statistics(self) -> Dict:
+        """Get rejection counts and avoided bytes by reason."""
+        return {reason: dict(counts) for reason, counts in self.rejections.items()}
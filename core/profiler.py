@@ -0,0 +1,93 @@
+# core/profiler.py
+import os
+import heapq
+from typing import Dict, List, Optional
+
+
+class ParseProfiler:
+    """Low-overhead timing counters for a CodebaseParser run.
+
+    Per language it keeps file and byte counts, cache hits and the time spent
+    reading and parsing; per phase (walk, prefilter) the total time. Only the
+    ``top_n`` slowest files are retained, in a min-heap, so memory stays
+    constant. The cost is a few perf_counter calls per file.
+    """
+
+    PHASES = ('walk', 'prefilter')
+
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        # Repository root; reported paths are made relative to it when set
+        self.root = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self.languages: Dict[str, Dict] = {}
+        self.phases = {phase: 0.0 for phase in self.PHASES}
+        self._slowest: List[tuple] = []
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Add time spent outside per-file parsing, e.g. walking the tree."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def record(self, path: str, language: str, size: int, read_seconds: float,
+               parse_seconds: float, cached: bool = False) -> None:
+        """Account one file that was read (and parsed unless cached)."""
+        stats = self.languages.get(language)
+        if stats is None:
+            stats = self.languages[language] = {'files': 0, 'bytes': 0, 'cache_hits': 0,
+                                                'read_seconds': 0.0, 'parse_seconds': 0.0}
+        stats['files'] += 1
+        stats['bytes'] += size
+        stats['cache_hits'] += cached
+        stats['read_seconds'] += read_seconds
+        stats['parse_seconds'] += parse_seconds
+
+        self._push((read_seconds + parse_seconds, path, language, size))
+
+    def _push(self, entry: tuple) -> None:
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest_files(self, n: Optional[int] = None) -> List[Dict]:
+        """The slowest files seen, slowest first."""
+        return [{'path': os.path.relpath(path, self.root) if self.root and os.path.isabs(path) else path,
+                 'language': language, 'bytes': size, 'seconds': round(seconds, 6)}
+                for seconds, path, language, size in heapq.nlargest(n or self.top_n, self._slowest)]
+
+    def to_dict(self) -> Dict:
+        """Mergeable, JSON-serialisable profile with derived MB/s per language."""
+        languages = {}
+        for language, stats in self.languages.items():
+            seconds = stats['read_seconds'] + stats['parse_seconds']
+            languages[language] = dict(stats, mb_per_second=round(stats['bytes'] / (1024 * 1024) / seconds, 2)
+                                       if seconds else None)
+        return {'phases': dict(self.phases), 'languages': languages, 'slowest_files': self.slowest_files()}
+
+    def merge(self, profile: Dict) -> None:
+        """Add a profile produced by to_dict (e.g. in a pool worker)."""
+        for phase, seconds in profile['phases'].items():
+            self.add_phase(phase, seconds)
+        for language, stats in profile['languages'].items():
+            own = self.languages.setdefault(language, {'files': 0, 'bytes': 0, 'cache_hits': 0,
+                                                       'read_seconds': 0.0, 'parse_seconds': 0.0})
+            for key in own:
+                own[key] += stats[key]
+        for entry in profile['slowest_files']:
+            self._push((entry['seconds'], entry['path'], entry['language'], entry['bytes']))
+
+    def format_report(self, n: int = 10) -> List[str]:
+        """Human-readable lines: per-language throughput, then the n slowest files."""
+        lines = []
+        for language, stats in sorted(self.to_dict()['languages'].items(),
+                                      key=lambda item: -(item[1]['read_seconds'] + item[1]['parse_seconds'])):
+            lines.append(f"{language}: {stats['files']} files, {stats['bytes'] / (1024 * 1024):.1f} MB, "
+                         f"read {stats['read_seconds']:.2f}s, parse {stats['parse_seconds']:.2f}s"
+                         + (f" ({stats['mb_per_second']} MB/s)" if stats['mb_per_second'] else ""))
+        lines.append(', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases.items()))
+        for entry in self.slowest_files(n):
+            lines.append(f"{entry['seconds'] * 1000:8.1f} ms  {entry['path']} ({entry['language']})")
+        return lines
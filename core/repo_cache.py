@@ -0,0 +1,138 @@
+# core/repo_cache.py
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from typing import Dict, List, Tuple
+
+DEFAULT_MIRROR_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ai-code-docs', 'mirrors')
+
+
+class RepositoryMirrorCache:
+    """Persistent bare mirrors of remote repositories.
+
+    The first checkout of a URL creates a ``git clone --bare``; later
+    checkouts only ``git fetch`` new branch and tag objects and add a
+    detached worktree. Only ``refs/heads/*`` and tags are fetched: on GitHub
+    a true ``--mirror`` would also fetch every ``refs/pull/*`` ref.
+    Mirrors are evicted least recently used first once the cache exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_MIRROR_DIR, max_bytes: int = 5 * 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.last_stats = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def mirror_path(self, url: str) -> str:
+        """Return the mirror directory used for url."""
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, name + '.git')
+
+    def checkout(self, url: str) -> str:
+        """Create or update the mirror for url and check out HEAD in a new worktree."""
+        mirror = self.mirror_path(url)
+        start = time.perf_counter()
+        # Transfer is measured on the object store, before the worktree add
+        # writes its admin files and index under the mirror
+        objects = os.path.join(mirror, 'objects')
+        size_before = self._directory_size(objects)
+
+        try:
+            if os.path.isdir(mirror):
+                self._restrict_refspec(mirror)
+                self._git(mirror, 'fetch', '--prune', '--tags', 'origin')
+                mode = 'mirror-fetch'
+            else:
+                subprocess.run(['git', 'clone', '--bare', url, mirror],
+                               check=True, capture_output=True, text=True)
+                self._restrict_refspec(mirror)
+                mode = 'mirror-clone'
+            transferred = max(self._directory_size(objects) - size_before, 0)
+            worktree = tempfile.mkdtemp()
+            self._git(mirror, 'worktree', 'add', '--detach', '--force', worktree, 'HEAD')
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to update repository mirror: {e.stderr.strip()}")
+
+        # Directory mtime tracks last use for LRU eviction
+        os.utime(mirror)
+        self.last_stats = {
+            'mode': mode,
+            'seconds': round(time.perf_counter() - start, 2),
+            'bytes': transferred
+        }
+        return worktree
+
+    def release(self, worktree: str) -> None:
+        """Remove a worktree created by checkout and enforce the size budget."""
+        mirror = self._mirror_for_worktree(worktree)
+        if mirror:
+            subprocess.run(['git', '-C', mirror, 'worktree', 'remove', '--force', worktree],
+                           capture_output=True, text=True)
+            subprocess.run(['git', '-C', mirror, 'worktree', 'prune'],
+                           capture_output=True, text=True)
+        shutil.rmtree(worktree, ignore_errors=True)
+        self.evict(keep=mirror)
+
+    def evict(self, keep: str = None) -> List[str]:
+        """Delete least recently used mirrors until the cache fits max_bytes.
+
+        The mirror ``keep`` is never evicted. Returns the removed paths.
+        """
+        mirrors: List[Tuple[float, int, str]] = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith('.git') or not os.path.isdir(path):
+                continue
+            size = self._directory_size(path)
+            mirrors.append((os.path.getmtime(path), size, path))
+            total += size
+
+        removed = []
+        for _, size, path in sorted(mirrors):
+            if total <= self.max_bytes:
+                break
+            if keep and os.path.samefile(path, keep):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed.append(path)
+        return removed
+
+    def get_statistics(self) -> Dict:
+        """Get mode, duration and bytes fetched by the last checkout."""
+        return dict(self.last_stats)
+
+    def _restrict_refspec(self, mirror: str) -> None:
+        """Fetch branches into refs/heads only; drops pull refs left by older --mirror clones."""
+        self._git(mirror, 'config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*')
+        self._git(mirror, 'config', '--unset-all', 'remote.origin.mirror', check=False)
+        stale = self._git(mirror, 'for-each-ref', '--format=delete %(refname)', 'refs/pull').stdout
+        if stale:
+            subprocess.run(['git', '-C', mirror, 'update-ref', '--stdin'], input=stale,
+                           check=True, capture_output=True, text=True)
+
+    def _mirror_for_worktree(self, worktree: str) -> str:
+        try:
+            result = self._git(worktree, 'rev-parse', '--git-common-dir')
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return os.path.abspath(os.path.join(worktree, result.stdout.strip()))
+
+    def _git(self, repo_path: str, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        return subprocess.run(['git', '-C', repo_path] + list(args),
+                              check=check, capture_output=True, text=True)
+
+    def _directory_size(self, path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
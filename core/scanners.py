@@ -0,0 +1,723 @@
+# core/scanners.py
+"""
+Single-pass source scanners used by CodebaseParser.
+
+Scanners run compiled patterns with ``finditer`` over whole blocks of text
+instead of line by line. In the JavaScript and Java token patterns, comments
+and string literals are alternatives of their own, so keywords inside them
+are consumed and never reported. Line numbers are tracked by counting
+newlines between consecutive matches, keeping every scan linear.
+
+Scanners accept str or bytes. CodebaseParser passes pure-ASCII files as the
+raw bytes it read, which are matched with bytes twins of the same patterns
+(identical results on ASCII input); only the names that are emitted get
+decoded.
+"""
+
+import os
+import re
+import mmap
+from html import unescape
+from typing import Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+def _bytes_pattern(pattern: Pattern) -> Pattern:
+    """Compile the bytes twin of an ASCII str pattern."""
+    return re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE)
+
+
+def _decode_name(value: Optional[bytes]) -> Optional[str]:
+    return value.decode('utf-8', errors='ignore') if value is not None else None
+
+
+def _same(value):
+    return value
+
+
+# Every branch starts with a literal character so the regex engine can skip
+# ahead with a first-character set; keyword boundaries are checked in Python.
+# The import clause is a lazy run of single characters that stops at the
+# ``from`` before the quote or at the next ``import``; each step consumes one
+# character, so a clause that never reaches a quote is scanned once per
+# ``import`` rather than backtracked over token by token.
+_JS_TOKEN = re.compile(r'''
+    //[^\n]*
+  | /\*(?:[^*]|\*(?!/))*(?:\*/|\Z)
+  | '(?:[^'\\\n]|\\.)*'
+  | "(?:[^"\\\n]|\\.)*"
+  | `(?:[^`\\]|\\.)*`
+  | import\b(?:(?:(?!(?<![\w$])import\b)[\w$*{},\s])*?(?<![\w$])from)?\s*['"](?P<import>[^'"\n]+)['"]
+  | require\s*\(\s*['"](?P<require>[^'"\n]+)['"]\s*\)
+  | export\s*\{(?P<export_list>[^}]*)\}(?:\s*from\s*['"](?P<reexport>[^'"\n]+)['"])?
+  | export\s+(?:default\s+)?(?:async\s+)?(?P<export_kind>function|class|const)\s*\*?\s*(?!extends\b)(?P<export_name>[\w$]+)
+        (?P<export_arrow>\s*=\s*(?:async\s*)?(?:\([^)]*\)|[\w$]+)\s*=>|\s*=\s*(?:async\s+)?function\b)?
+  | function\s*\*?\s*(?P<function>[\w$]+)
+  | class\s+(?!extends\b)(?P<class>[\w$]+)
+  | const\s+(?P<const>[\w$]+)\s*=\s*(?:async\s*)?(?:\([^)]*\)|[\w$]+)\s*=>
+  | const\s+(?P<const_function>[\w$]+)\s*=\s*(?:async\s+)?function\b
+  | :\s*(?:async\s+)?function\b(?P<method>)
+''', re.VERBOSE)
+
+_JS_TOKEN_BYTES = _bytes_pattern(_JS_TOKEN)
+
+# Characters as str and as the ints that indexing bytes yields
+_IDENTIFIER_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+_IDENTIFIER_CHARS |= frozenset(''.join(_IDENTIFIER_CHARS).encode('ascii'))
+_BLANK_CHARS = frozenset(' \t') | frozenset(b' \t')
+_SPACE_CHARS = frozenset(' \t\r\n') | frozenset(b' \t\r\n')
+_EXPORT_ALIAS = re.compile(r'\s+as\s+')
+
+
+def scan_javascript(content: Union[str, bytes]) -> Dict[str, List]:
+    """Extract functions, classes, imports, exports and dependencies from JS/TS source."""
+    is_bytes = isinstance(content, bytes)
+    token = _JS_TOKEN_BYTES if is_bytes else _JS_TOKEN
+    newline, dot, question = (b'\n', ord('.'), ord('?')) if is_bytes else ('\n', '.', '?')
+    name_of = _decode_name if is_bytes else _same
+    functions = []
+    classes = []
+    imports = []
+    exports = []
+    dependencies = []
+
+    line = 1
+    last = 0
+    for match in token.finditer(content):
+        kind = match.lastgroup
+        start = match.start()
+        if kind is None or (start and content[start - 1] in _IDENTIFIER_CHARS and kind != 'method'):
+            # Comment, string literal, or a keyword embedded in a longer identifier
+            continue
+
+        line += content.count(newline, last, start)
+        last = start
+
+        if kind == 'import' or kind == 'require':
+            name = name_of(match.group(kind))
+            imports.append(name)
+            dependencies.append({'type': 'import', 'name': name, 'line': line})
+        elif kind == 'method':
+            # The property name precedes the ':'; walk back over it
+            end = start
+            while end and content[end - 1] in _BLANK_CHARS:
+                end -= 1
+            begin = end
+            while begin and content[begin - 1] in _IDENTIFIER_CHARS:
+                begin -= 1
+            before = begin
+            while before and content[before - 1] in _SPACE_CHARS:
+                before -= 1
+            # A '.' makes it a member access, a '?' the middle of a conditional
+            if begin < end and (not begin or content[begin - 1] != dot) and (not before or content[before - 1] != question):
+                functions.append({'name': name_of(content[begin:end]), 'line': line})
+        elif kind == 'function' or kind == 'const' or kind == 'const_function':
+            functions.append({'name': name_of(match.group(kind)), 'line': line})
+        elif kind == 'class':
+            classes.append({'name': name_of(match.group(kind)), 'line': line})
+        elif match.group('export_name'):
+            name = name_of(match.group('export_name'))
+            export_kind = name_of(match.group('export_kind'))
+            exports.append(name)
+            if export_kind == 'class':
+                classes.append({'name': name, 'line': line})
+            elif export_kind == 'function' or match.group('export_arrow'):
+                functions.append({'name': name, 'line': line})
+        else:
+            for item in name_of(match.group('export_list')).split(','):
+                item = item.strip()
+                if item:
+                    exports.append(_EXPORT_ALIAS.split(item)[-1].strip())
+            reexport = name_of(match.group('reexport'))
+            if reexport:
+                imports.append(reexport)
+                dependencies.append({'type': 'import', 'name': reexport, 'line': line})
+
+    return {'functions': functions, 'classes': classes, 'imports': imports,
+            'exports': exports, 'dependencies': dependencies}
+
+
+# Every branch is a deterministic, non-nested loop, so the cost per byte is
+# bounded regardless of input; declarations are recognised over the tokens.
+_JAVA_TOKEN = re.compile(r'''
+    (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<text>"""[\s\S]*?(?:"""|\Z)|"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<annotation>@\s*[A-Za-z_$][\w$]*(?:\s*\.\s*[A-Za-z_$][\w$]*)*)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<number>[0-9][\w.]*)
+  | (?P<punct>[^\s\w])
+''', re.VERBOSE)
+
+_JAVA_TYPE_KEYWORDS = frozenset(['class', 'interface', 'enum', 'record', '@interface'])
+# 'record' is only a contextual keyword; it starts a declaration after one of these
+_JAVA_MODIFIERS = frozenset(['public', 'protected', 'private', 'static', 'final', 'abstract', 'sealed', 'strictfp'])
+
+# Identifiers that can never be a method name, or can never precede one
+_JAVA_NOT_METHOD = frozenset([
+    'if', 'for', 'while', 'switch', 'catch', 'synchronized', 'return', 'new', 'throw',
+    'else', 'case', 'assert', 'try', 'do', 'super', 'this', 'yield', 'instanceof',
+    'extends', 'implements', 'throws', 'import', 'package', 'default'
+])
+_JAVA_NOT_BEFORE_METHOD = (_JAVA_NOT_METHOD | _JAVA_TYPE_KEYWORDS) - {'synchronized', 'default'}
+
+
+def scan_java(content: str) -> Dict:
+    """Extract the package, classes, methods and imports from Java source.
+
+    Declarations may span several lines and carry annotations; method
+    signatures are recognised as ``<type> name(...) [throws ...] {``.
+    """
+    functions = []
+    classes = []
+    imports = []
+    dependencies = []
+    package = None
+
+    line = 1
+    last = 0
+
+    # Statement being collected: 'package' or 'import' with its name parts
+    statement = None
+    statement_parts = []
+    statement_line = 0
+    # Pending type declaration after class/interface/enum/record
+    type_keyword = None
+    # 'record Name' is only a declaration if '(' or '<' follows
+    pending_record = None
+    # Candidate method; depth counts its parameter parentheses
+    candidate = None
+    depth = 0
+    after_params = False
+    # Parenthesised annotation arguments are skipped
+    annotation_depth = 0
+    annotation_pending = False
+    prev = prev_kind = None
+    before_prev = before_prev_kind = None
+    prev_start = 0
+
+    for match in _JAVA_TOKEN.finditer(content):
+        kind = match.lastgroup
+        if kind == 'comment':
+            continue
+        text = match.group()
+
+        if annotation_pending:
+            annotation_pending = False
+            if text == '(':
+                annotation_depth = 1
+                continue
+        if annotation_depth:
+            if text == '(':
+                annotation_depth += 1
+            elif text == ')':
+                annotation_depth -= 1
+            continue
+
+        if statement:
+            if text == ';':
+                name = ''.join(statement_parts)
+                if statement == 'package':
+                    package = name
+                elif name:
+                    imports.append(name)
+                    dependencies.append({'type': 'import', 'name': name, 'line': statement_line})
+                statement = None
+                prev, prev_kind = text, kind
+            elif text == 'static' and not statement_parts:
+                statement_parts.append('static ')
+            else:
+                statement_parts.append(text)
+            continue
+
+        if pending_record:
+            if text in ('(', '<'):
+                classes.append(pending_record)
+            pending_record = None
+        if type_keyword == 'record' and kind != 'ident':
+            type_keyword = None
+
+        if candidate:
+            if not after_params:
+                if text == '(':
+                    depth += 1
+                elif text == ')':
+                    depth -= 1
+                    if depth == 0:
+                        after_params = True
+                continue
+            if text == '{':
+                functions.append(candidate)
+                candidate = None
+            elif kind == 'ident' or text in (',', '.'):
+                # throws clause
+                continue
+            else:
+                candidate = None
+
+        if kind == 'ident':
+            if prev is None or prev in (';', '{', '}') or prev_kind == 'annotation':
+                if text == 'package' or text == 'import':
+                    start = match.start()
+                    line += content.count('\n', last, start)
+                    last = start
+                    statement = text
+                    statement_parts = []
+                    statement_line = line
+                    prev, prev_kind = text, kind
+                    continue
+            if type_keyword:
+                start = match.start()
+                line += content.count('\n', last, start)
+                last = start
+                if type_keyword == 'record':
+                    pending_record = {'name': text, 'line': line}
+                else:
+                    classes.append({'name': text, 'line': line})
+                type_keyword = None
+            elif text == 'record':
+                if prev is None or prev in (';', '{', '}') or prev_kind == 'annotation' or prev in _JAVA_MODIFIERS:
+                    type_keyword = text
+            elif text in _JAVA_TYPE_KEYWORDS and prev != '.':
+                type_keyword = text
+        elif kind == 'annotation':
+            if text == '@interface':
+                type_keyword = text
+            else:
+                annotation_pending = True
+        elif text == '(' and prev_kind == 'ident' and prev not in _JAVA_NOT_METHOD:
+            if before_prev is not None and (
+                    (before_prev_kind == 'ident' and before_prev not in _JAVA_NOT_BEFORE_METHOD)
+                    or before_prev in ('>', ']')):
+                start = prev_start
+                line += content.count('\n', last, start)
+                last = start
+                candidate = {'name': prev, 'line': line}
+                depth = 1
+                after_params = False
+
+        before_prev, before_prev_kind = prev, prev_kind
+        prev, prev_kind = text, kind
+        prev_start = match.start()
+
+    return {
+        'package': package,
+        'functions': functions,
+        'classes': classes,
+        'imports': imports,
+        'dependencies': dependencies
+    }
+
+
+def _split_leading_literal(pattern: str) -> Optional[Tuple[str, str]]:
+    """Split pattern into its leading literal character and the rest.
+
+    Returns None unless the pattern starts with a single, unquantified
+    literal character and has no top-level alternation.
+    """
+    if pattern[:1] == '\\':
+        if len(pattern) < 2 or pattern[1].isalnum():
+            return None
+        first, rest = pattern[1], pattern[2:]
+    elif pattern and pattern[0] not in '.^$*+?{}[]()|':
+        first, rest = pattern[0], pattern[1:]
+    else:
+        return None
+    if rest[:1] in ('*', '+', '?', '{'):
+        return None
+
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(rest):
+        char = rest[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal member
+            i += 1 + (rest[i + 1:i + 2] == '^')
+            i += rest[i:i + 1] == ']'
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return None
+        i += 1
+    return first, rest
+
+
+class PatternScanner:
+    """Scan text once with a single alternation of rules.
+
+    ``rules`` are (name, pattern, handler) triples compiled at construction
+    into one pattern, each rule wrapped in a named group. Every match is
+    dispatched as ``handler(result, line, *groups)`` with the rule's own
+    capture groups, so the text is traversed once however many rules there
+    are. Rules are grouped by their leading literal character, which the
+    regex engine uses to skip ahead, so a position is only tried against the
+    rules that can start there; the cost per MB then stays nearly flat as rules are
+    added. Rule patterns may use plain groups but no named groups or
+    backreferences, since their groups are renumbered, and must be ASCII so
+    bytes can be scanned too. Where rules overlap at a position the earlier
+    one wins, except that rules without a leading literal are tried last.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str, Callable]], flags: int = 0):
+        buckets: Dict[str, List[str]] = {}
+        general = []
+        for name, pattern, handler in rules:
+            split = None if flags & re.VERBOSE else _split_leading_literal(pattern)
+            if split is None:
+                general.append(f'(?P<{name}>{pattern})')
+            else:
+                first, rest = split
+                key = first.lower() if flags & re.IGNORECASE else first
+                buckets.setdefault(key, []).append(f'(?P<{name}>{rest})')
+        self.pattern = re.compile('|'.join(
+            [f"{re.escape(first)}(?:{'|'.join(alternatives)})" for first, alternatives in buckets.items()]
+            + general), flags)
+        self.bytes_pattern = _bytes_pattern(self.pattern)
+
+        self.handlers = {}
+        for name, pattern, handler in rules:
+            group = self.pattern.groupindex[name]
+            # Slice of match.groups() holding this rule's capture groups
+            self.handlers[name] = (handler, slice(group, group + re.compile(pattern, flags).groups))
+
+    def scan(self, text: Union[str, bytes], result: Dict, line: int = 1, limit: Optional[int] = None) -> Dict:
+        """Dispatch matches starting before ``limit``; ``line`` is the line at offset 0.
+
+        ``text`` may be str or bytes; handlers always receive str groups.
+        """
+        if limit is None:
+            limit = len(text)
+        is_bytes = isinstance(text, bytes)
+        newline = b'\n' if is_bytes else '\n'
+        handlers = self.handlers
+        last = 0
+        for match in (self.bytes_pattern if is_bytes else self.pattern).finditer(text):
+            start = match.start()
+            if start >= limit:
+                break
+            line += text.count(newline, last, start)
+            last = start
+            handler, groups = handlers[match.lastgroup]
+            values = match.groups()[groups]
+            if is_bytes:
+                values = [_decode_name(value) for value in values]
+            handler(result, line, *values)
+        return result
+
+
+def _jsp_import(result: Dict, line: int, name: str) -> None:
+    result['java_imports'].append(name)
+    result['dependencies'].append({'type': 'jsp_import', 'name': name, 'line': line})
+
+
+def _jsp_include(result: Dict, line: int, name: str) -> None:
+    result['jsp_includes'].append(name)
+    result['dependencies'].append({'type': 'jsp_include', 'name': name, 'line': line})
+
+
+def _jsp_forward(result: Dict, line: int, page: str) -> None:
+    # <jsp:forward> is also a custom tag; the alternation reports it once
+    result['jsp_tags'].append('jsp:forward')
+    result['jsp_includes'].append(page)
+    result['dependencies'].append({'type': 'jsp_forward', 'name': page, 'line': line})
+
+
+def _jsp_custom_tag(result: Dict, line: int, namespace: str, tag: str) -> None:
+    result['jsp_tags'].append(f"{namespace}:{tag}")
+
+
+JSP_RULES = [
+    ('page_import', r'''<%@\s*page\b(?:[^%]|%(?!>))*?\bimport\s*=\s*["']([^"']+)["']''', _jsp_import),
+    ('include', r'''<%@\s*include\s+file\s*=\s*["']([^"']+)["']''', _jsp_include),
+    ('forward', r'''<jsp:forward\s+page\s*=\s*["']([^"']+)["']''', _jsp_forward),
+    ('custom_tag', r'<(\w+):(\w+)', _jsp_custom_tag),
+]
+JSP_SCANNER = PatternScanner(JSP_RULES)
+
+
+def scan_jsp(content: Union[str, bytes]) -> Dict[str, List]:
+    """Extract page imports, includes, forwards and custom tags from JSP."""
+    result = JSP_SCANNER.scan(content, {'jsp_tags': [], 'java_imports': [], 'jsp_includes': [],
+                                        'dependencies': []})
+    result['imports'] = result['java_imports'] + result['jsp_includes']
+    return result
+
+
+def _sql_symbol(key: str) -> Callable:
+    def handler(result: Dict, line: int, name: str) -> None:
+        result[key].append({'name': name, 'line': line})
+    return handler
+
+
+def _sql_reference(result: Dict, line: int, name: str) -> None:
+    result['dependencies'].append({'type': 'table_reference', 'name': name, 'line': line})
+
+
+# Same statements as the original per-line patterns; whitespace may not cross
+# a line break, so scanning a whole block of lines finds exactly what a
+# line-by-line scan would.
+SQL_SCANNER = PatternScanner([
+    ('table', r'CREATE[^\S\r\n]+TABLE[^\S\r\n]+(?:IF[^\S\r\n]+NOT[^\S\r\n]+EXISTS[^\S\r\n]+)?(\w+)', _sql_symbol('tables')),
+    ('procedure', r'CREATE[^\S\r\n]+(?:OR[^\S\r\n]+REPLACE[^\S\r\n]+)?PROCEDURE[^\S\r\n]+(\w+)', _sql_symbol('procedures')),
+    ('function', r'CREATE[^\S\r\n]+(?:OR[^\S\r\n]+REPLACE[^\S\r\n]+)?FUNCTION[^\S\r\n]+(\w+)', _sql_symbol('functions')),
+    ('reference', r'REFERENCES[^\S\r\n]+(\w+)', _sql_reference),
+], re.IGNORECASE)
+
+
+def _scan_sql_block(text: str, first_line: int, limit: int, result: Dict[str, List]) -> None:
+    """Append SQL symbols whose match starts before ``limit`` in text."""
+    SQL_SCANNER.scan(text, result, first_line, limit)
+
+
+def scan_sql(content: Union[str, bytes]) -> Dict[str, List]:
+    """Extract tables, procedures, functions and REFERENCES from SQL text."""
+    result = {'tables': [], 'procedures': [], 'functions': [], 'dependencies': []}
+    _scan_sql_block(content, 1, len(content), result)
+    return result
+
+
+def scan_sql_file(file_path: str, chunk_size: int = 8 * 1024 * 1024, overlap: int = 64 * 1024) -> Dict:
+    """Stream a large SQL file through a memory map in bounded chunks.
+
+    Chunks end at the last newline in the window, so no statement can
+    straddle a boundary. A window without any newline is extended by
+    ``overlap`` bytes and only matches starting before the cut are kept.
+    Returns the scan_sql keys plus ``size`` (characters) and ``lines``.
+    """
+    result = {'tables': [], 'procedures': [], 'functions': [], 'dependencies': []}
+    chars = 0
+    line = 1
+
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            result.update({'size': 0, 'lines': 0})
+            return result
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = min(start + chunk_size, size)
+                window_end = end
+                if end < size:
+                    newline = mm.rfind(b'\n', start, end)
+                    if newline != -1:
+                        end = window_end = newline + 1
+                    else:
+                        window_end = min(end + overlap, size)
+
+                text = mm[start:window_end].decode('utf-8', errors='ignore')
+                body = text if window_end == end else mm[start:end].decode('utf-8', errors='ignore')
+                _scan_sql_block(text, line, len(body), result)
+
+                line += body.count('\n')
+                # Text-mode reads fold \r\n into one character
+                chars += len(body) - body.count('\r\n')
+
+                # Drop the scanned pages so resident memory stays at one chunk
+                if hasattr(mmap, 'MADV_DONTNEED'):
+                    page_start = start - start % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, page_start, end - page_start)
+                start = end
+
+            ends_with_newline = mm[size - 1:size] == b'\n'
+
+    result['size'] = chars
+    result['lines'] = line - 1 if ends_with_newline else line
+    return result
+
+
+_CSS_SELECTOR = re.compile(r'([^{}\n]+)\s*{')
+_CSS_SELECTOR_BYTES = _bytes_pattern(_CSS_SELECTOR)
+_CSS_IMPORT = re.compile(r'''@import\s+["']([^"']+)["']''')
+_CSS_IMPORT_BYTES = _bytes_pattern(_CSS_IMPORT)
+
+
+def scan_css(content: Union[str, bytes]) -> Dict:
+    """Extract selectors and @import targets from CSS."""
+    is_bytes = isinstance(content, bytes)
+    name_of = _decode_name if is_bytes else _same
+    selectors = []
+    for selector in (_CSS_SELECTOR_BYTES if is_bytes else _CSS_SELECTOR).findall(content):
+        selector = selector.strip()
+        if selector:
+            selectors.append(name_of(selector))
+    css_imports = [name_of(name) for name in (_CSS_IMPORT_BYTES if is_bytes else _CSS_IMPORT).findall(content)]
+
+    return {
+        'selectors': selectors,
+        'total_rules': len(selectors),
+        'css_imports': css_imports,
+        # Would need line-by-line parsing for exact line numbers
+        'dependencies': [{'type': 'css_import', 'name': name, 'line': 1} for name in css_imports]
+    }
+
+
+# HTML attributes with quoted values, written without nested quantifiers.
+# Unquoted runs stop at '<', so a '<letter' that never closes (``a <b`` in
+# text) fails at the next '<' instead of scanning on to the end of the text.
+_HTML_ATTRS = r'''[^<>"']*(?:(?:"[^"]*"|'[^']*')[^<>"']*)*'''
+
+# Comments and the raw-text bodies of <script>/<style> are consumed whole, so
+# markup inside them is not counted. End tags match no branch and are skipped.
+# The \Z alternatives let an unterminated comment or element run to the end
+# of the text; the *_end groups tell whether the terminator was seen.
+_HTML_TOKEN = re.compile(rf'''
+    <!--.*?(?:(?P<comment_end>-->)|\Z)
+  | <[!?][^>]*>
+  | <(?:(?P<raw>script|style)(?![\w:.-])|(?P<tag>[A-Za-z][\w:.-]*))(?P<attrs>{_HTML_ATTRS})>
+        (?(raw).*?(?:(?P<raw_end></(?P=raw)\s*>)|\Z))
+''', re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+_HTML_LINK = re.compile(r'''(?<![^\s"'/])(?:src|href)\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s"'=<>`]+))''',
+                        re.IGNORECASE)
+
+_HTML_TOKEN_BYTES = _bytes_pattern(_HTML_TOKEN)
+_HTML_LINK_BYTES = _bytes_pattern(_HTML_LINK)
+
+_EXTERNAL_LINK_PREFIXES = ('http://', 'https://', 'mailto:', '#')
+
+# Characters kept between streamed chunks while looking for a terminator
+_HTML_CLOSING_TAIL = 64
+
+
+def _html_closing(raw: Optional[str]) -> Pattern:
+    return re.compile(rf'</{raw}\s*>' if raw else '-->', re.IGNORECASE)
+
+
+def _scan_html_block(text: Union[str, bytes], pos: int, line: int, result: Dict, final: bool = True,
+                     overlap: int = 64 * 1024) -> Tuple[int, Optional[Pattern]]:
+    """Count tags and collect src/href links in text[pos:].
+
+    ``line`` is the line number at ``pos``. Returns the offset scanned up to
+    and, when the text ends inside a comment or <script>/<style> body, the
+    pattern of its terminator. Unless ``final``, a tag cut off by the end of
+    text is left unscanned so the caller can retry it with the next chunk.
+    """
+    is_bytes = isinstance(text, bytes)
+    token, link_pattern = (_HTML_TOKEN_BYTES, _HTML_LINK_BYTES) if is_bytes else (_HTML_TOKEN, _HTML_LINK)
+    newline = b'\n' if is_bytes else '\n'
+    tags = result['tags']
+    links = result['resource_links']
+    dependencies = result['dependencies']
+    last = pos
+    scanned = pos
+
+    for match in token.finditer(text, pos):
+        name, raw = match.group('tag', 'raw')
+        if name is None:
+            if raw is None:
+                comment = text[match.start():match.start() + 4] in ('<!--', b'<!--')
+                if not final and comment and match.group('comment_end') is None:
+                    return max(len(text) - _HTML_CLOSING_TAIL, match.start() + 4), _html_closing(None)
+                scanned = match.end()
+                continue
+            name = raw
+
+        name = name.lower()
+        if is_bytes:
+            name = name.decode('ascii')
+        tags[name] = tags.get(name, 0) + 1
+        attrs_start, attrs_end = match.span('attrs')
+        # The shortest link attribute is ' src=x'
+        links_in_tag = link_pattern.finditer(text, attrs_start, attrs_end) if attrs_end - attrs_start > 5 else ()
+        for link in links_in_tag:
+            value = link.group('dq')
+            if value is None:
+                value = link.group('sq')
+                if value is None:
+                    value = link.group('bare')
+            if not value:
+                continue
+            if is_bytes:
+                value = value.decode('utf-8', errors='ignore')
+            if '&' in value:
+                value = unescape(value)
+            start = link.start()
+            line += text.count(newline, last, start)
+            last = start
+            links.append(value)
+            if not value.startswith(_EXTERNAL_LINK_PREFIXES):
+                dependencies.append({'type': 'resource_link', 'name': value, 'line': line})
+
+        if raw and not final and match.group('raw_end') is None:
+            return max(len(text) - _HTML_CLOSING_TAIL, attrs_end + 1), _html_closing(name)
+        scanned = match.end()
+
+    if not final:
+        # An unmatched '<' near the end may be a tag the next chunk completes
+        cut = text.rfind(b'<' if is_bytes else '<', scanned)
+        if cut != -1 and len(text) - cut < overlap:
+            return cut, None
+    return len(text), None
+
+
+def scan_html(content: Union[str, bytes]) -> Dict:
+    """Count start tags and extract src/href links with their line numbers.
+
+    One pass over content, without a lowercased copy; attribute values are
+    read with their quotes and HTML entities resolved.
+    """
+    result = {'tags': {}, 'resource_links': [], 'dependencies': []}
+    _scan_html_block(content, 0, 1, result)
+    result['total_tags'] = sum(result['tags'].values())
+    return result
+
+
+def scan_html_file(file_path: str, chunk_size: int = 1024 * 1024, overlap: int = 64 * 1024) -> Dict:
+    """Stream a large HTML file in bounded chunks with the scan_html scanner.
+
+    A tag cut off by a chunk boundary is carried into the next chunk; inside
+    a long comment or <script>/<style> body only its terminator is searched
+    for, keeping a short tail between chunks. Returns the scan_html keys
+    plus ``size`` (characters) and ``lines``.
+    """
+    result = {'tags': {}, 'resource_links': [], 'dependencies': []}
+    chars = newlines = 0
+    last_char = ''
+    line = 1
+    pending = ''
+    closing = None
+
+    # Text mode decodes like CodebaseParser._decode, universal newlines included
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            final = not chunk
+            if chunk:
+                chars += len(chunk)
+                newlines += chunk.count('\n')
+                last_char = chunk[-1]
+            text = pending + chunk
+            pos = 0
+
+            if closing is not None:
+                end = closing.search(text)
+                if end is None:
+                    if final:
+                        break
+                    pos = max(len(text) - _HTML_CLOSING_TAIL, 0)
+                    line += text.count('\n', 0, pos)
+                    pending = text[pos:]
+                    continue
+                pos = end.end()
+                closing = None
+                line += text.count('\n', 0, pos)
+
+            stop, closing = _scan_html_block(text, pos, line, result, final, overlap)
+            if final:
+                break
+            line += text.count('\n', pos, stop)
+            pending = text[stop:]
+
+    result['total_tags'] = sum(result['tags'].values())
+    result['size'] = chars
+    result['lines'] = newlines + (1 if last_char and last_char != '\n' else 0)
+    return result
@@ -0,0 +1,164 @@
+# core/shards.py
+"""
+Sharded analysis for monorepos: parse each subtree independently (possibly on
+different machines) and merge the partial results later.
+
+    python -m core.shards analyze REPO services/billing -o billing.json
+    python -m core.shards merge billing.json search.json ... -o output
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.parser import CodebaseParser, MetadataAggregator
+from core.graph_builder import DependencyGraphBuilder
+from core.metadata_io import dump_metadata_document
+from core.file_metadata import json_default
+
+SHARD_FORMAT_VERSION = 1
+
+# Shard of the files directly in the repository root (package.json, pom.xml, ...)
+ROOT_SHARD = '.'
+
+
+def top_level_directories(parser: CodebaseParser, repo_path: str) -> List[str]:
+    """Top-level directories of repo_path that are not ignored, in the order a full walk visits them."""
+    matcher = parser.compile_path_matcher(repo_path)
+    return [name for name in os.listdir(repo_path)
+            if os.path.isdir(os.path.join(repo_path, name)) and not matcher.is_ignored(name, is_dir=True)]
+
+
+def plan_shards(parser: CodebaseParser, repo_path: str) -> List[str]:
+    """The root shard followed by one shard per top-level directory that is not ignored."""
+    return [ROOT_SHARD] + sorted(top_level_directories(parser, repo_path))
+
+
+def analyze_shard(parser: CodebaseParser, repo_path: str, subdir: str, commit: Optional[str] = None) -> Dict:
+    """Parse one subtree and return its partial metadata.
+
+    The partial holds the shard's ``files`` (paths relative to repo_path),
+    ``language_stats``, totals, the dependency ``edges`` of the shard on its
+    own and the references that stayed ``unresolved`` inside it.
+    ROOT_SHARD parses only the files directly in repo_path and also records
+    the top-level ``directories`` in walk order, so merge_shards can restore
+    the file order of a full run.
+    """
+    if subdir == ROOT_SHARD:
+        metadata = parser.parse_codebase(repo_path, recursive=False)
+    else:
+        metadata = parser.parse_codebase(repo_path, subdir=subdir)
+    builder = DependencyGraphBuilder()
+    builder.build_dependency_graph(metadata)
+    shard = {
+        'format': 'shard',
+        'format_version': SHARD_FORMAT_VERSION,
+        'shard': subdir,
+        'commit': commit,
+        'files': metadata['files'],
+        'language_stats': metadata['language_stats'],
+        'total_files': metadata['total_files'],
+        'total_lines': metadata['total_lines'],
+        'edges': builder.get_edges(),
+        'unresolved': [[path, dep] for path, dep in builder.unresolved_dependencies],
+    }
+    if subdir == ROOT_SHARD:
+        shard['directories'] = top_level_directories(parser, repo_path)
+    return shard
+
+
+def merge_shards(shards: Iterable[Dict]) -> Tuple[Dict, DependencyGraphBuilder]:
+    """Combine shard partials into one parse_codebase-shaped metadata and graph.
+
+    Every dependency is resolved again by DependencyGraphBuilder against the
+    files of all shards, which links imports that cross shard boundaries.
+    A shard's own edges are not reused: a match by Java class name or fuzzy
+    file name inside one shard can lose to a file in another shard, so only
+    the merged file map gives the edges of a full run. Shards must not overlap.
+    With a ROOT_SHARD partial, shards are merged in full-walk order (root
+    files first, then the top-level directories as the walk visited them).
+    """
+    aggregator = MetadataAggregator()
+    builder = DependencyGraphBuilder()
+    builder.reset()
+    seen = {}
+    shards = list(shards)
+    directories = next((shard['directories'] for shard in shards if shard['shard'] == ROOT_SHARD), None)
+    if directories is not None:
+        position = {name: i for i, name in enumerate(directories)}
+        # Shards below one top-level directory keep their relative order
+        shards.sort(key=lambda shard: -1 if shard['shard'] == ROOT_SHARD
+                    else position.get(shard['shard'].replace(os.sep, '/').strip('/').split('/')[0], len(position)))
+
+    for shard in shards:
+        if shard.get('format') != 'shard' or shard.get('format_version', 0) > SHARD_FORMAT_VERSION:
+            raise Exception(f"Unsupported shard format in {shard.get('shard')!r}")
+        for file_data in shard['files']:
+            if file_data['path'] in seen:
+                raise Exception(f"{file_data['path']} is in shards {seen[file_data['path']]!r} "
+                                f"and {shard['shard']!r}")
+            seen[file_data['path']] = shard['shard']
+            aggregator.add(file_data)
+            builder.add_file(file_data)
+    builder.resolve_dependencies()
+
+    return aggregator.get_metadata(), builder
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Analyze monorepo subtrees as shards and merge them')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser('analyze', help='Parse one or more subtrees into shard files')
+    analyze.add_argument('repo_path', help='Local repository checkout')
+    analyze.add_argument('subdirs', nargs='*',
+                         help=f'Subtrees to analyze; {ROOT_SHARD!r} is the files in the repository root '
+                              f'(default: the root and every top-level directory)')
+    analyze.add_argument('--output', '-o', default='shards',
+                         help='Shard file (one subdir) or directory for shard files (default: shards)')
+    analyze.add_argument('--jobs', '-j', type=int, default=1, help='Parallel parser processes per shard')
+
+    merge = commands.add_parser('merge', help='Merge shard files into metadata.json and a dependency graph')
+    merge.add_argument('shard_files', nargs='+', help='Shard files written by analyze')
+    merge.add_argument('--output', '-o', default='output', help='Output directory (default: output)')
+
+    args = arg_parser.parse_args()
+
+    if args.command == 'analyze':
+        parser = CodebaseParser(jobs=args.jobs)
+        commit = parser.get_head_commit(args.repo_path)
+        subdirs = args.subdirs or plan_shards(parser, args.repo_path)
+        single_file = len(args.subdirs) == 1 and args.output.endswith('.json')
+        if not single_file:
+            os.makedirs(args.output, exist_ok=True)
+        for subdir in subdirs:
+            shard = analyze_shard(parser, args.repo_path, subdir, commit)
+            name = '__root__' if subdir == ROOT_SHARD else subdir.replace('/', '__')
+            path = args.output if single_file else os.path.join(args.output, name + '.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(shard, f, default=json_default)
+            print(f"📦 {subdir}: {shard['total_files']} files, {len(shard['edges'])} edges, "
+                  f"{len(shard['unresolved'])} unresolved -> {path}")
+    else:
+        shards = []
+        for path in args.shard_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                shards.append(json.load(f))
+        metadata, builder = merge_shards(shards)
+        graph_stats = builder.get_graph_statistics()
+        os.makedirs(args.output, exist_ok=True)
+        metadata_path = os.path.join(args.output, 'metadata.json')
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            dump_metadata_document({
+                'metadata': metadata,
+                'graph_stats': graph_stats,
+                'commit': shards[0].get('commit') if shards else None,
+                'shards': [shard['shard'] for shard in shards],
+            }, f)
+        print(f"🧩 Merged {len(shards)} shards: {metadata['total_files']} files, "
+              f"{graph_stats.get('total_edges', 0)} dependencies -> {metadata_path}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+# core/symbol_index.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.file_metadata import json_default
+
+# Parser keys stored as definitions (symbols) and as references to other code
+SYMBOL_KINDS = {'functions': 'function', 'classes': 'class', 'tables': 'table', 'procedures': 'procedure'}
+REFERENCE_KEYS = {'imports': 'import', 'jsp_tags': 'jsp_tag'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_id TEXT,
+    started REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    language TEXT,
+    size INTEGER,
+    lines INTEGER,
+    digest TEXT,
+    run_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    qualname TEXT,
+    line INTEGER,
+    end_line INTEGER,
+    fingerprint TEXT,
+    docstring TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_qualname ON symbols (qualname);
+CREATE INDEX IF NOT EXISTS symbols_file ON symbols (file_id);
+CREATE TABLE IF NOT EXISTS refs (
+    file_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER
+);
+CREATE INDEX IF NOT EXISTS refs_name ON refs (name);
+CREATE INDEX IF NOT EXISTS refs_file ON refs (file_id);
+CREATE TABLE IF NOT EXISTS changes (
+    run_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    change TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_run ON changes (run_id, kind);
+"""
+
+
+def _fingerprint(symbol: Dict, source_hash: Optional[str] = None) -> str:
+    """Hash of a symbol that ignores where it sits in the file.
+
+    With ``source_hash`` (see _source_hashes) the symbol's source text is
+    part of it; without, only the span stands in for the body.
+    """
+    shape = {k: v for k, v in symbol.items() if k not in ('line', 'end_line')}
+    if source_hash is not None:
+        shape['source'] = source_hash
+    elif symbol.get('end_line') is not None and symbol.get('line') is not None:
+        shape['span'] = symbol['end_line'] - symbol['line']
+    return hashlib.sha1(json.dumps(shape, sort_keys=True, default=json_default).encode('utf-8')).hexdigest()
+
+
+def _digest(file_metadata: Dict, source_hash: Optional[str] = None) -> str:
+    entry = {k: v for k, v in file_metadata.items() if k != 'path'}
+    if source_hash is not None:
+        entry['source'] = source_hash
+    return hashlib.sha1(json.dumps(entry, sort_keys=True, default=json_default).encode('utf-8')).hexdigest()
+
+
+def _source_hashes(file_path: str, symbols: List[Dict]) -> Optional[Tuple[str, List[Optional[str]]]]:
+    """Hash of a file's source and of each symbol's lines, or None if it cannot be read.
+
+    A symbol spans from its line to its end_line or, when the parser gives
+    none (Java, JavaScript, SQL), to the line before the next symbol. Lines
+    are hashed without their endings and read one at a time, so moving a
+    symbol keeps its hash and large files are not held in memory.
+    """
+    starts = sorted({symbol['line'] for symbol in symbols if symbol.get('line')})
+    spans = []
+    for symbol in symbols:
+        line = symbol.get('line')
+        if not line:
+            spans.append(None)
+            continue
+        end = symbol.get('end_line')
+        if end is None:
+            following = bisect_right(starts, line)
+            end = starts[following] - 1 if following < len(starts) else None
+        spans.append((line, end))
+    order = sorted((span[0], i) for i, span in enumerate(spans) if span)
+    hashers = [hashlib.sha1() if span else None for span in spans]
+    file_hash = hashlib.sha1()
+    active = []
+    position = 0
+    try:
+        with open(file_path, 'rb') as f:
+            for number, text in enumerate(f, 1):
+                text = text.rstrip(b'\r\n') + b'\n'
+                file_hash.update(text)
+                while position < len(order) and order[position][0] <= number:
+                    active.append(order[position][1])
+                    position += 1
+                if active:
+                    for i in active:
+                        hashers[i].update(text)
+                    active = [i for i in active if spans[i][1] is None or spans[i][1] > number]
+    except OSError:
+        return None
+    return file_hash.hexdigest(), [hasher.hexdigest() if hasher else None for hasher in hashers]
+
+
+def _change_name(qualname: str, ordinal: int) -> str:
+    """Name recorded in ``changes``; later same-named symbols (overloads) get #2, #3, ..."""
+    return qualname if ordinal == 0 else f'{qualname}#{ordinal + 1}'
+
+
+class SymbolIndex:
+    """SQLite index of CodebaseParser output for fast cross-run lookups.
+
+    Definitions (functions, classes, SQL tables and procedures) go to
+    ``symbols``; imports, dependencies and JSP tags go to ``refs``. Files are
+    updated one at a time and skipped when their metadata digest is
+    unchanged. Every run records added, removed and modified functions and
+    classes in ``changes``; a symbol is modified when its fingerprint, which
+    covers its source lines when the checkout is given, changes. Symbols
+    sharing a name in one file (overloads) are told apart by their order.
+    Docstrings are searchable through FTS5 when the SQLite build has it,
+    otherwise through LIKE.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+        try:
+            self.conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS docstrings USING fts5(name, docstring)')
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self.run_id = None
+        self.stats = {'updated': 0, 'unchanged': 0, 'removed': 0}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> 'SymbolIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def begin_run(self, commit: Optional[str] = None) -> int:
+        """Start a run; changes recorded by later updates are attributed to it."""
+        cursor = self.conn.execute('INSERT INTO runs (commit_id, started) VALUES (?, ?)', (commit, time.time()))
+        self.run_id = cursor.lastrowid
+        self.stats = {'updated': 0, 'unchanged': 0, 'removed': 0}
+        return self.run_id
+
+    def index_metadata(self, metadata: Dict, commit: Optional[str] = None, prune: bool = True,
+                       repo_path: Optional[str] = None) -> Dict:
+        """Bring the index in line with a parse_codebase/update_codebase result.
+
+        Files missing from metadata are removed when ``prune`` is set.
+        ``repo_path`` is the checkout metadata was parsed from; with it,
+        fingerprints cover the symbols' source (see update_file).
+        Returns counts of updated, unchanged and removed files.
+        """
+        self.begin_run(commit)
+        with self.conn:
+            seen = set()
+            for file_metadata in metadata['files']:
+                seen.add(file_metadata['path'])
+                self.update_file(file_metadata,
+                                 os.path.join(repo_path, file_metadata['path']) if repo_path else None)
+            if prune:
+                stale = [row['path'] for row in self.conn.execute('SELECT path FROM files')
+                         if row['path'] not in seen]
+                for path in stale:
+                    self.remove_file(path)
+        return dict(self.stats)
+
+    def update_file(self, file_metadata: Dict, source_path: Optional[str] = None) -> bool:
+        """Insert or replace one file's rows. Returns False if it was unchanged.
+
+        ``source_path`` is the file on disk. When given, the digest and each
+        symbol's fingerprint include its source lines, so an edit inside a
+        body is seen even where the parser records only names and lines.
+        """
+        path = file_metadata['path']
+        symbols = [(kind, symbol) for key, kind in SYMBOL_KINDS.items() for symbol in file_metadata.get(key) or ()]
+        hashes = _source_hashes(source_path, [symbol for _, symbol in symbols]) if source_path else None
+        source_hash, symbol_hashes = hashes if hashes else (None, [None] * len(symbols))
+        digest = _digest(file_metadata, source_hash)
+        row = self.conn.execute('SELECT id, digest FROM files WHERE path = ?', (path,)).fetchone()
+        if row and row['digest'] == digest:
+            self.stats['unchanged'] += 1
+            return False
+
+        old_symbols = {}
+        if row:
+            file_id = row['id']
+            old_symbols = self._symbol_fingerprints(file_id)
+            self._delete_rows(file_id)
+            self.conn.execute('UPDATE files SET language = ?, size = ?, lines = ?, digest = ?, run_id = ? '
+                              'WHERE id = ?', (file_metadata.get('language'), file_metadata.get('size'),
+                                               file_metadata.get('lines'), digest, self.run_id, file_id))
+        else:
+            file_id = self.conn.execute(
+                'INSERT INTO files (path, language, size, lines, digest, run_id) VALUES (?, ?, ?, ?, ?, ?)',
+                (path, file_metadata.get('language'), file_metadata.get('size'),
+                 file_metadata.get('lines'), digest, self.run_id)).lastrowid
+
+        new_symbols = {}
+        ordinals = {}
+        for (kind, symbol), symbol_hash in zip(symbols, symbol_hashes):
+            fingerprint = _fingerprint(symbol, symbol_hash)
+            qualname = symbol.get('qualname') or symbol['name']
+            ordinal = ordinals[(kind, qualname)] = ordinals.get((kind, qualname), -1) + 1
+            new_symbols[(kind, qualname, ordinal)] = fingerprint
+            symbol_id = self.conn.execute(
+                'INSERT INTO symbols (file_id, kind, name, qualname, line, end_line, fingerprint, docstring) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (file_id, kind, symbol['name'], qualname, symbol.get('line'), symbol.get('end_line'),
+                 fingerprint, symbol.get('docstring'))).lastrowid
+            if self.fts and symbol.get('docstring'):
+                self.conn.execute('INSERT INTO docstrings (rowid, name, docstring) VALUES (?, ?, ?)',
+                                  (symbol_id, qualname, symbol['docstring']))
+
+        refs = [(file_id, kind, name, None)
+                for key, kind in REFERENCE_KEYS.items() for name in file_metadata.get(key) or ()]
+        refs.extend((file_id, dep.get('type', 'dependency'), dep['name'], dep.get('line'))
+                    for dep in file_metadata.get('dependencies') or ())
+        self.conn.executemany('INSERT INTO refs (file_id, kind, name, line) VALUES (?, ?, ?, ?)', refs)
+
+        self._record_changes(path, old_symbols, new_symbols)
+        self.stats['updated'] += 1
+        return True
+
+    def remove_file(self, path: str) -> bool:
+        """Drop a file and its rows. Returns False if it was not indexed."""
+        row = self.conn.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()
+        if not row:
+            return False
+        self._record_changes(path, self._symbol_fingerprints(row['id']), {})
+        self._delete_rows(row['id'])
+        self.conn.execute('DELETE FROM files WHERE id = ?', (row['id'],))
+        self.stats['removed'] += 1
+        return True
+
+    def _symbol_fingerprints(self, file_id: int) -> Dict:
+        fingerprints = {}
+        ordinals = {}
+        for row in self.conn.execute('SELECT kind, qualname, fingerprint FROM symbols WHERE file_id = ? ORDER BY id',
+                                     (file_id,)):
+            name = (row['kind'], row['qualname'])
+            ordinals[name] = ordinals.get(name, -1) + 1
+            fingerprints[name + (ordinals[name],)] = row['fingerprint']
+        return fingerprints
+
+    def _delete_rows(self, file_id: int) -> None:
+        if self.fts:
+            self.conn.execute('DELETE FROM docstrings WHERE rowid IN (SELECT id FROM symbols WHERE file_id = ?)',
+                              (file_id,))
+        self.conn.execute('DELETE FROM symbols WHERE file_id = ?', (file_id,))
+        self.conn.execute('DELETE FROM refs WHERE file_id = ?', (file_id,))
+
+    def _record_changes(self, path: str, old: Dict, new: Dict) -> None:
+        if self.run_id is None:
+            return
+        changes = []
+        for key in old.keys() | new.keys():
+            if key not in old:
+                change = 'added'
+            elif key not in new:
+                change = 'removed'
+            elif old[key] != new[key]:
+                change = 'modified'
+            else:
+                continue
+            changes.append((self.run_id, path, key[0], _change_name(key[1], key[2]), change))
+        self.conn.executemany('INSERT INTO changes (run_id, path, kind, name, change) VALUES (?, ?, ?, ?, ?)',
+                              changes)
+
+    def commit(self) -> None:
+        """Commit updates made through update_file/remove_file."""
+        self.conn.commit()
+
+    def find_definitions(self, name: str, kind: Optional[str] = None) -> List[Dict]:
+        """Where is a function/class/table/procedure defined? Matches name or qualname."""
+        query = ('SELECT f.path, s.kind, s.name, s.qualname, s.line FROM symbols s JOIN files f ON f.id = s.file_id '
+                 'WHERE (s.name = ? OR s.qualname = ?)')
+        params = [name, name]
+        if kind:
+            query += ' AND s.kind = ?'
+            params.append(kind)
+        return [dict(row) for row in self.conn.execute(query + ' ORDER BY f.path, s.line', params)]
+
+    def find_importers(self, module: str, kinds: Optional[Iterable[str]] = None) -> List[str]:
+        """Paths of files that import or depend on module (exact name match)."""
+        query = 'SELECT DISTINCT f.path FROM refs r JOIN files f ON f.id = r.file_id WHERE r.name = ?'
+        params = [module]
+        if kinds:
+            kinds = list(kinds)
+            query += f" AND r.kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        return [row['path'] for row in self.conn.execute(query + ' ORDER BY f.path', params)]
+
+    def changed_symbols(self, run_id: Optional[int] = None, kind: Optional[str] = 'function') -> List[Dict]:
+        """Symbols added, removed or modified in a run (default: the latest run)."""
+        if run_id is None:
+            row = self.conn.execute('SELECT MAX(id) AS id FROM runs').fetchone()
+            run_id = row['id']
+        query = 'SELECT path, kind, name, change FROM changes WHERE run_id = ?'
+        params = [run_id]
+        if kind:
+            query += ' AND kind = ?'
+            params.append(kind)
+        return [dict(row) for row in self.conn.execute(query + ' ORDER BY path, name', params)]
+
+    def search_docstrings(self, text: str, limit: int = 50) -> List[Dict]:
+        """Full-text search over docstrings (FTS5 match syntax when available)."""
+        if self.fts:
+            rows = self.conn.execute(
+                'SELECT f.path, s.kind, s.qualname, s.line, s.docstring FROM docstrings d '
+                'JOIN symbols s ON s.id = d.rowid JOIN files f ON f.id = s.file_id '
+                'WHERE docstrings MATCH ? ORDER BY rank LIMIT ?', (text, limit))
+        else:
+            rows = self.conn.execute(
+                'SELECT f.path, s.kind, s.qualname, s.line, s.docstring FROM symbols s '
+                'JOIN files f ON f.id = s.file_id WHERE s.docstring LIKE ? LIMIT ?', (f'%{text}%', limit))
+        return [dict(row) for row in rows]
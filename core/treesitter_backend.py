@@ -0,0 +1,284 @@
+# core/treesitter_backend.py
+import importlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from tree_sitter import Language, Parser
+except ImportError:  # optional dependency: pip install -e .[tree-sitter]
+    Language = Parser = None
+
+try:
+    from tree_sitter import Query, QueryCursor
+except ImportError:  # tree-sitter < 0.25 runs queries without a cursor
+    QueryCursor = None
+    try:
+        from tree_sitter import Query
+    except ImportError:
+        Query = None
+
+# Grammar -> (module, function returning the compiled language). The grammar
+# wheels ship prebuilt parsers, so nothing is fetched or compiled at run time.
+GRAMMAR_MODULES = {
+    'javascript': ('tree_sitter_javascript', 'language'),
+    'typescript': ('tree_sitter_typescript', 'language_typescript'),
+    'tsx': ('tree_sitter_typescript', 'language_tsx'),
+    'java': ('tree_sitter_java', 'language'),
+}
+
+# (kind, query pattern) pairs. Patterns naming node types a grammar version
+# lacks are dropped when the query is compiled, so the list can cover both
+# JavaScript and TypeScript grammars.
+JAVA_PATTERNS = [
+    ('package', '(package_declaration (scoped_identifier) @name)'),
+    ('package', '(package_declaration (identifier) @name)'),
+    ('import', '(import_declaration) @name'),
+] + [('class', f'({node} name: (identifier) @name)') for node in (
+    'class_declaration', 'interface_declaration', 'enum_declaration', 'record_declaration',
+    'annotation_type_declaration')
+] + [('function', f'({node} name: (identifier) @name)') for node in (
+    'method_declaration', 'constructor_declaration', 'compact_constructor_declaration')]
+
+_JS_FUNCTION_VALUES = ('arrow_function', 'function_expression', 'function', 'generator_function')
+
+JAVASCRIPT_PATTERNS = [
+    ('import', '(import_statement source: (string) @name)'),
+    ('import', '(export_statement source: (string) @name)'),
+    ('call', '(call_expression function: (identifier) @callee arguments: (arguments . (string) @name))'),
+    ('call', '(call_expression function: (import) @callee arguments: (arguments . (string) @name))'),
+    ('export', '(export_statement declaration: (_ name: (_) @name))'),
+    ('export', '(export_statement declaration: (lexical_declaration (variable_declarator name: (identifier) @name)))'),
+    ('export', '(export_statement declaration: (variable_declaration (variable_declarator name: (identifier) @name)))'),
+    ('export_specifier', '(export_statement (export_clause (export_specifier) @name))'),
+] + [('class', f'({node} name: (_) @name)') for node in (
+    'class_declaration', 'abstract_class_declaration', 'class')
+] + [('function', f'({node} name: (_) @name)') for node in (
+    'function_declaration', 'generator_function_declaration', 'method_definition')
+] + [('function', f'(variable_declarator name: (identifier) @name value: ({value}))') for value in _JS_FUNCTION_VALUES
+] + [('function', f'(pair key: (property_identifier) @name value: ({value}))') for value in _JS_FUNCTION_VALUES
+] + [('function', f'({field} {name}: (property_identifier) @name value: ({value}))')
+     for field, name in (('field_definition', 'property'), ('public_field_definition', 'name'))
+     for value in _JS_FUNCTION_VALUES]
+
+
+def _text(node, source: bytes) -> str:
+    return source[node.start_byte:node.end_byte].decode('utf-8', errors='surrogatepass')
+
+
+def _string_value(node, source: bytes) -> Optional[str]:
+    """Value of a string literal node without its quotes."""
+    if node is None or node.type not in ('string', 'template_string'):
+        return None
+    return _text(node, source)[1:-1]
+
+
+def _common_affixes(old: bytes, new: bytes) -> Tuple[int, int]:
+    """Length of the common prefix and (non-overlapping) common suffix."""
+    limit = min(len(old), len(new))
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    prefix = lo
+    lo, hi = 0, limit - prefix
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return prefix, lo
+
+
+def _point(source: bytes, offset: int) -> Tuple[int, int]:
+    return source.count(b'\n', 0, offset), offset - (source.rfind(b'\n', 0, offset) + 1)
+
+
+def _compile_query(language: 'Language', patterns: List[Tuple[str, str]]):
+    """Compile the patterns this grammar accepts; returns (query, kind per pattern index)."""
+    def compile_query(source: str):
+        return Query(language, source) if Query is not None else language.query(source)
+
+    valid = []
+    for kind, pattern in patterns:
+        try:
+            compile_query(pattern)
+        except Exception:
+            continue
+        valid.append((kind, pattern))
+    return compile_query('\n'.join(pattern for _, pattern in valid)), [kind for kind, _ in valid]
+
+
+def _captures(query, kinds: List[str], node) -> List[Tuple[str, object, Dict]]:
+    """(kind, @name node, all captures) for every match, in source order."""
+    matches = QueryCursor(query).matches(node) if QueryCursor is not None else query.matches(node)
+    found = []
+    for pattern_index, captures in matches:
+        captures = {name: nodes if isinstance(nodes, list) else [nodes] for name, nodes in captures.items()}
+        for name_node in captures.get('name', ()):
+            found.append((kinds[pattern_index], name_node, captures))
+    found.sort(key=lambda item: item[1].start_byte)
+    return found
+
+
+class TreeSitterBackend:
+    """Optional tree-sitter parser for Java, JavaScript and TypeScript.
+
+    Produces the same keys as scan_java/scan_javascript but from a real
+    syntax tree, so multi-line signatures, generics, decorators and class
+    methods are handled. The last tree for each of up to ``max_cached_trees``
+    paths is kept; when the same path is parsed again the changed byte range
+    is applied with ``Tree.edit`` and only that region is reparsed.
+
+    Incremental reparsing only applies to library callers that parse the
+    same path repeatedly in one process (an editor integration or a watch
+    loop). A parse_codebase run parses each path once, and pool workers
+    start with an empty cache, so CodebaseParser creates the backend with
+    ``max_cached_trees=0`` and no source buffers or trees are retained.
+    ``parse`` returns None when tree-sitter or a grammar is unavailable so
+    CodebaseParser falls back to the regex scanners.
+    """
+
+    def __init__(self, max_cached_trees: int = 256):
+        self.max_cached_trees = max_cached_trees
+        self._languages: Dict[str, Optional['Language']] = {}
+        self._parsers: Dict[str, 'Parser'] = {}
+        self._queries: Dict[str, Tuple] = {}
+        self._trees: 'OrderedDict[str, Tuple[bytes, object]]' = OrderedDict()
+        self.stats = {'full': 0, 'incremental': 0}
+
+    def __getstate__(self):
+        # Parsers and trees are native objects; pool workers start empty
+        return {'max_cached_trees': self.max_cached_trees}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(**state)
+
+    @staticmethod
+    def grammar_for(language: str, file_path: str) -> str:
+        if language == 'typescript' and file_path.lower().endswith('.tsx'):
+            return 'tsx'
+        return language
+
+    def _parser(self, grammar: str) -> Optional['Parser']:
+        if grammar not in self._languages:
+            self._languages[grammar] = None
+            if Parser is not None and grammar in GRAMMAR_MODULES:
+                module_name, function = GRAMMAR_MODULES[grammar]
+                try:
+                    module = importlib.import_module(module_name)
+                    self._languages[grammar] = Language(getattr(module, function)())
+                    self._parsers[grammar] = Parser(self._languages[grammar])
+                except (ImportError, AttributeError, TypeError, ValueError):
+                    self._languages[grammar] = None
+        return self._parsers.get(grammar)
+
+    def supports(self, language: str, file_path: str = '') -> bool:
+        """True if tree-sitter and the grammar for this language are installed."""
+        return self._parser(self.grammar_for(language, file_path)) is not None
+
+    def parse(self, language: str, content: Union[str, bytes], file_path: str) -> Optional[Dict]:
+        """Parse str or UTF-8 bytes content and extract metadata, or return None to fall back."""
+        grammar = self.grammar_for(language, file_path)
+        parser = self._parser(grammar)
+        if parser is None:
+            return None
+
+        source = content if isinstance(content, bytes) else content.encode('utf-8', errors='surrogatepass')
+        tree = self._parse_tree(parser, grammar, file_path, source)
+        if grammar == 'java':
+            return self._extract_java(tree.root_node, source)
+        return self._extract_javascript(grammar, tree.root_node, source)
+
+    def _parse_tree(self, parser: 'Parser', grammar: str, file_path: str, source: bytes):
+        key = f"{grammar}\0{file_path}"
+        previous = self._trees.pop(key, None)
+        if previous is not None and previous[0] == source:
+            tree = previous[1]
+        elif previous is not None:
+            old_source, old_tree = previous
+            prefix, suffix = _common_affixes(old_source, source)
+            old_end, new_end = len(old_source) - suffix, len(source) - suffix
+            old_tree.edit(start_byte=prefix, old_end_byte=old_end, new_end_byte=new_end,
+                          start_point=_point(source, prefix), old_end_point=_point(old_source, old_end),
+                          new_end_point=_point(source, new_end))
+            tree = parser.parse(source, old_tree)
+            self.stats['incremental'] += 1
+        else:
+            tree = parser.parse(source)
+            self.stats['full'] += 1
+
+        if self.max_cached_trees:
+            self._trees[key] = (source, tree)
+            while len(self._trees) > self.max_cached_trees:
+                self._trees.popitem(last=False)
+        return tree
+
+    def forget(self, file_path: str) -> None:
+        """Drop cached trees for a path (e.g. after it was deleted)."""
+        for key in [key for key in self._trees if key.split('\0', 1)[1] == file_path]:
+            del self._trees[key]
+
+    def _query(self, grammar: str, patterns: List[Tuple[str, str]]):
+        if grammar not in self._queries:
+            self._queries[grammar] = _compile_query(self._languages[grammar], patterns)
+        return self._queries[grammar]
+
+    def _extract_java(self, root, source: bytes) -> Dict:
+        package = None
+        functions: List[Dict] = []
+        classes: List[Dict] = []
+        imports: List[str] = []
+        dependencies: List[Dict] = []
+
+        for kind, node, _ in _captures(*self._query('java', JAVA_PATTERNS), root):
+            line = node.start_point[0] + 1
+            if kind == 'package':
+                package = ''.join(_text(node, source).split())
+            elif kind == 'import':
+                name = ''
+                for part in node.children:
+                    if part.type == 'static':
+                        name = 'static '
+                    elif part.type == 'asterisk':
+                        name += '.*'
+                    elif part.type in ('scoped_identifier', 'identifier'):
+                        name += ''.join(_text(part, source).split())
+                imports.append(name)
+                dependencies.append({'type': 'import', 'name': name, 'line': line})
+            else:
+                (classes if kind == 'class' else functions).append({'name': _text(node, source), 'line': line})
+
+        return {'package': package, 'functions': functions, 'classes': classes,
+                'imports': imports, 'dependencies': dependencies}
+
+    def _extract_javascript(self, grammar: str, root, source: bytes) -> Dict:
+        functions: List[Dict] = []
+        classes: List[Dict] = []
+        imports: List[str] = []
+        exports: List[str] = []
+        dependencies: List[Dict] = []
+
+        for kind, node, captures in _captures(*self._query(grammar, JAVASCRIPT_PATTERNS), root):
+            line = node.start_point[0] + 1
+            if kind == 'call' and _text(captures['callee'][0], source) not in ('require', 'import'):
+                continue
+            if kind in ('import', 'call'):
+                # Report the line of the statement or call, not of the (possibly wrapped) string
+                name = _string_value(node, source)
+                if name:
+                    statement = node.parent if kind == 'import' else captures['callee'][0]
+                    imports.append(name)
+                    dependencies.append({'type': 'import', 'name': name, 'line': statement.start_point[0] + 1})
+            elif kind == 'export':
+                exports.append(_text(node, source))
+            elif kind == 'export_specifier':
+                exports.append(_text(node.child_by_field_name('alias') or node.child_by_field_name('name'), source))
+            else:
+                (classes if kind == 'class' else functions).append({'name': _text(node, source), 'line': line})
+
+        return {'functions': functions, 'classes': classes, 'imports': imports,
+                'exports': exports, 'dependencies': dependencies}
@@ -55,6 +55,14 @@ class StructuredDocumentationGenerator:
     def _generate_index_md(self, metadata: Dict, overview_content: str) -> str:
         """Generate index.md with project overview."""
         
+        # Sampled runs only keep the parsed files; use the estimated counts
+        sampling = metadata.get('sampling')
+        if sampling:
+            structure_counts = sampling['project_structure']
+        else:
+            structure_counts = {category: len(files) for category, files in metadata.get('project_structure', {}).items()}
+        estimated = ' (estimated from a sample)' if sampling else ''
+        
         content = f"""# Project Documentation
 
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -63,7 +71,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 {overview_content}
 
-## Project Statistics
+## Project Statistics{estimated}
 
 | Metric | Value |
 |--------|-------|
@@ -91,12 +99,12 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 ## Quick Navigation
 
 ### Project Structure
-- **Web Components**: {len(metadata.get('project_structure', {}).get('web_files', []))} files
-- **Backend Logic**: {len(metadata.get('project_structure', {}).get('backend_files', []))} files
-- **Database Scripts**: {len(metadata.get('project_structure', {}).get('database_files', []))} files
-- **Configuration**: {len(metadata.get('project_structure', {}).get('config_files', []))} files
-- **Tests**: {len(metadata.get('project_structure', {}).get('test_files', []))} files
-- **Documentation**: {len(metadata.get('project_structure', {}).get('documentation_files', []))} files
+- **Web Components**: {structure_counts.get('web_files', 0)} files
+- **Backend Logic**: {structure_counts.get('backend_files', 0)} files
+- **Database Scripts**: {structure_counts.get('database_files', 0)} files
+- **Configuration**: {structure_counts.get('config_files', 0)} files
+- **Tests**: {structure_counts.get('test_files', 0)} files
+- **Documentation**: {structure_counts.get('documentation_files', 0)} files
 
 ---
 
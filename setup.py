@@ -17,6 +17,15 @@ setup(
         "plotly>=5.17.0",
         "python-dotenv>=1.0.0",
     ],
+    extras_require={
+        # Prebuilt grammar wheels; no grammar is downloaded or compiled at run time
+        "tree-sitter": [
+            "tree-sitter>=0.23",
+            "tree-sitter-java>=0.23",
+            "tree-sitter-javascript>=0.23",
+            "tree-sitter-typescript>=0.23",
+        ],
+    },
     entry_points={
         'console_scripts': [
             'ai-docs=agent:main',
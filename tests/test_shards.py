@@ -0,0 +1,36 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parser import CodebaseParser
+from core.graph_builder import DependencyGraphBuilder
+from core.shards import plan_shards, analyze_shard, merge_shards
+
+
+def write(root, path, content):
+    path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def edges(builder):
+    return sorted((source, target) for source, target, *_ in builder.get_edges())
+
+
+def test_cross_shard_import_is_not_fuzzy_matched_inside_the_shard(tmp_path):
+    root = str(tmp_path)
+    write(root, 'a/x.js', "import { helper } from '../b/util';\n")
+    write(root, 'a/utility.js', 'export function other() {}\n')
+    write(root, 'b/util.js', 'export function helper() {}\n')
+    parser = CodebaseParser()
+
+    full = DependencyGraphBuilder()
+    full.build_dependency_graph(parser.parse_codebase(root))
+    shards = [analyze_shard(parser, root, subdir) for subdir in plan_shards(parser, root)]
+    metadata, merged = merge_shards(shards)
+
+    assert ('a/x.js', 'b/util.js') in edges(full)
+    assert edges(merged) == edges(full)
+    assert [f['path'] for f in metadata['files']] == [f['path'] for f in parser.parse_codebase(root)['files']]
@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.parser import CodebaseParser
+from core.symbol_index import SymbolIndex
+
+ORDERS = """package com.example;
+
+public class Orders {
+    public int total(int count) {
+        return count * 2;
+    }
+
+    public int total(int count, int tax) {
+        return count + tax;
+    }
+}
+"""
+
+
+def index_run(index, root):
+    index.index_metadata(CodebaseParser().parse_codebase(root), repo_path=root)
+    return index.changed_symbols(kind=None)
+
+
+def test_java_method_body_edit_is_modified(tmp_path):
+    root = tmp_path / 'repo'
+    root.mkdir()
+    source = root / 'Orders.java'
+    source.write_text(ORDERS)
+
+    with SymbolIndex(str(tmp_path / 'index.db')) as index:
+        added = index_run(index, str(root))
+        assert sorted(change['name'] for change in added) == ['Orders', 'total', 'total#2']
+
+        # Same size and line count: only the body of the first overload differs
+        source.write_text(ORDERS.replace('count * 2', 'count * 3'))
+        changes = index_run(index, str(root))
+
+    assert changes == [{'path': 'Orders.java', 'kind': 'function', 'name': 'total', 'change': 'modified'}]